@@ -2,12 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any
+import os
+from itertools import pairwise
+from operator import itemgetter
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Any
 from datetime import timedelta
 from pathlib import Path
+from types import ModuleType
 
 import voluptuous as vol
+from homeassistant.components import persistent_notification
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, ServiceCall
@@ -24,7 +31,6 @@ from .const import (
     CONF_CHARGER_POWER,
     CONF_BATTERY_HEALTH,
     CONF_OPTIMIZED_CHARGING_ENABLED,
-    CONF_LEARN_FROM_HISTORY,
     CONF_MAX_HISTORY_SAMPLES,
     DEFAULT_MAX_HISTORY_SAMPLES,
     DOMAIN,
@@ -35,13 +41,36 @@ from .const import (
     MODEL_FILE_SUFFIX,
 )
 
+if TYPE_CHECKING:
+    from .history_manager import HistoryManager
+
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.BINARY_SENSOR, Platform.SENSOR]
 
+# Secondary indexes stored alongside entry records in hass.data[DOMAIN].
+# Names are not unique, so the name index maps to records by entry id.
+DATA_BY_NAME = "_by_name"
+DATA_BY_BATTERY = "_by_battery"
+# Load task for the history manager shared by all entries.
+DATA_HISTORY_MANAGER = "_history_manager"
+
 # Config schema for YAML configuration (legacy support)
 CONFIG_SCHEMA = vol.Schema({DOMAIN: vol.Schema({})}, extra=vol.ALLOW_EXTRA)
 
+# Recorder history module, imported on first use by the import service.
+_RECORDER_HISTORY: ModuleType | None = None
+
+
+def _get_recorder_history() -> ModuleType:
+    """Return the recorder history module, importing it once on first use."""
+    global _RECORDER_HISTORY
+    if _RECORDER_HISTORY is None:
+        from homeassistant.components.recorder import history
+
+        _RECORDER_HISTORY = history
+    return _RECORDER_HISTORY
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up SmartCharge Predictor from a config entry."""
@@ -49,60 +78,27 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # Defer heavy imports to setup time to avoid import side effects during config flow load.
     from .coordinator import SmartChargeCoordinator
-    from .history_manager import HistoryManager
     from .model import ChargingModel
 
-    # Get device configuration (merge data and options).
+    # Get device configuration (merge data and options once and reuse it).
     config = {**entry.data, **entry.options}
     device_name = config[CONF_DEVICE_NAME]
-    device_id = f"{device_name}_{config['battery_entity']}"
+    device_id = f"{device_name}_{config[CONF_BATTERY_ENTITY]}"
 
     # Initialize components.
-    history_manager = HistoryManager(hass)
-    await history_manager.async_load()
-
-    # Clean up orphaned devices (devices that no longer exist).
-    # Collect all active device IDs from all config entries for this domain.
-    active_device_ids: set[str] = set()
-
-    # Get device IDs from already-loaded entries.
-    for entry_id, entry_data in hass.data.get(DOMAIN, {}).items():
-        if "device_id" in entry_data:
-            active_device_ids.add(entry_data["device_id"])
-
-    # Also get device IDs from all config entries (including not-yet-loaded ones).
-    for entry in hass.config_entries.async_entries(DOMAIN):
-        config = {**entry.data, **entry.options}
-        if CONF_DEVICE_NAME in config and CONF_BATTERY_ENTITY in config:
-            entry_device_id = (
-                f"{config[CONF_DEVICE_NAME]}_{config[CONF_BATTERY_ENTITY]}"
-            )
-            active_device_ids.add(entry_device_id)
-
-    # Also include current entry's device_id.
-    active_device_ids.add(device_id)
-
-    # Clean up orphaned history.
-    orphaned_ids = history_manager.cleanup_orphaned_devices(active_device_ids)
-
-    # Clean up orphaned model files.
-    if orphaned_ids:
-        storage_path = Path(hass.config.path(STORAGE_DIR))
-        for orphaned_id in orphaned_ids:
-            model_file = storage_path / f"{orphaned_id}{MODEL_FILE_SUFFIX}"
-            if model_file.exists():
-                try:
-                    model_file.unlink()
-                    _LOGGER.info("Removed orphaned model file: %s", model_file.name)
-                except Exception as err:
-                    _LOGGER.warning(
-                        "Failed to remove orphaned model file %s: %s",
-                        model_file.name,
-                        err,
-                    )
-
-        # Save history after cleanup.
-        await history_manager.async_save(immediate=True)
+    history_manager = await _async_get_history_manager(hass)
+
+    # Collect active device IDs from all config entries for this domain
+    # (including not-yet-loaded ones) so orphaned devices can be cleaned up.
+    active_device_ids: set[str] = {device_id}
+    for other_entry in hass.config_entries.async_entries(DOMAIN):
+        if other_entry.entry_id == entry.entry_id:
+            continue
+        other_config = {**other_entry.data, **other_entry.options}
+        other_name = other_config.get(CONF_DEVICE_NAME)
+        other_battery = other_config.get(CONF_BATTERY_ENTITY)
+        if other_name is not None and other_battery is not None:
+            active_device_ids.add(f"{other_name}_{other_battery}")
 
     # Set max history samples for this device.
     max_history_samples = config.get(
@@ -117,14 +113,23 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass, device_id, config, history_manager, charging_model
     )
 
-    # Store coordinator and components.
-    hass.data[DOMAIN][entry.entry_id] = {
+    # Store coordinator and components, indexed for service lookups.
+    entry_record = {
         "coordinator": coordinator,
         "history_manager": history_manager,
         "charging_model": charging_model,
+        "config": config,
         "device_id": device_id,
         "device_name": device_name,
     }
+    domain_data = hass.data[DOMAIN]
+    domain_data[entry.entry_id] = entry_record
+    domain_data.setdefault(DATA_BY_NAME, {}).setdefault(device_name, {})[
+        entry.entry_id
+    ] = entry_record
+    domain_data.setdefault(DATA_BY_BATTERY, {})[config[CONF_BATTERY_ENTITY]] = (
+        entry_record
+    )
 
     # Create device entry.
     device_registry = dr.async_get(hass)
@@ -140,9 +145,19 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Forward to sensor platforms.
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Clean up orphaned history and model files off the setup critical path.
+    entry.async_create_background_task(
+        hass,
+        _async_cleanup_orphans(hass, history_manager, active_device_ids),
+        "smartcharge_cleanup",
+    )
+
     # Register services.
     await _register_services(hass)
 
+    # Reload on options changes so cached config values are rebuilt.
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
     # Start coordinator.
     await coordinator.async_config_entry_first_refresh()
 
@@ -150,15 +165,88 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+async def _async_get_history_manager(hass: HomeAssistant) -> HistoryManager:
+    """Return the shared history manager, loading it once for all entries."""
+    domain_data = hass.data[DOMAIN]
+    load_task = domain_data.get(DATA_HISTORY_MANAGER)
+    if load_task is None:
+        # Entries set up concurrently wait on the same load.
+        load_task = domain_data[DATA_HISTORY_MANAGER] = hass.async_create_task(
+            _async_load_history_manager(hass), "smartcharge_history_load"
+        )
+    return await load_task
+
+
+async def _async_load_history_manager(hass: HomeAssistant) -> HistoryManager:
+    """Create the history manager and load stored history."""
+    from .history_manager import HistoryManager
+
+    history_manager = HistoryManager(hass)
+    await history_manager.async_load()
+    return history_manager
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when its options change."""
+    # Keep the unpickled model cached across the unload/setup pair.
+    entry_record = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if entry_record is not None:
+        entry_record["reloading"] = True
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def _async_cleanup_orphans(
+    hass: HomeAssistant,
+    history_manager: HistoryManager,
+    active_device_ids: set[str],
+) -> None:
+    """Remove history and model files for devices that no longer exist."""
+    from .model import evict_cached_model
+
+    orphaned_ids = history_manager.cleanup_orphaned_devices(active_device_ids)
+    if not orphaned_ids:
+        return
+
+    for orphaned_id in orphaned_ids:
+        evict_cached_model(orphaned_id)
+
+    storage_path = Path(hass.config.path(STORAGE_DIR))
+
+    def _remove_model_files() -> None:
+        # Runs in the executor: one directory scan, then unlink only the hits.
+        expected = {f"{orphaned_id}{MODEL_FILE_SUFFIX}" for orphaned_id in orphaned_ids}
+        try:
+            with os.scandir(storage_path) as it:
+                existing = {e.name for e in it if e.is_file()}
+        except FileNotFoundError:
+            return
+
+        for name in existing & expected:
+            try:
+                os.unlink(storage_path / name)
+                _LOGGER.info("Removed orphaned model file: %s", name)
+            except Exception as err:
+                _LOGGER.warning(
+                    "Failed to remove orphaned model file %s: %s", name, err
+                )
+
+    await hass.async_add_executor_job(_remove_model_files)
+
+    # Save history after cleanup.
+    await history_manager.async_save(immediate=True)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
         # Clean up data.
-        if entry.entry_id in hass.data[DOMAIN]:
-            coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-            history_manager = hass.data[DOMAIN][entry.entry_id]["history_manager"]
+        domain_data = hass.data[DOMAIN]
+        if entry.entry_id in domain_data:
+            entry_record = domain_data[entry.entry_id]
+            coordinator = entry_record["coordinator"]
+            history_manager = entry_record["history_manager"]
 
             # Clean up coordinator resources.
             coordinator._cleanup_state_listener()  # type: ignore[attr-defined]
@@ -166,15 +254,78 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             # Save history before cleanup (immediate save).
             await history_manager.async_save(immediate=True)
 
-            del hass.data[DOMAIN][entry.entry_id]
+            # Release the device's unpickled model unless setup follows.
+            if not entry_record.get("reloading"):
+                from .model import evict_cached_model
+
+                evict_cached_model(entry_record["device_id"])
+
+            del domain_data[entry.entry_id]
+            by_name = domain_data.get(DATA_BY_NAME, {})
+            named = by_name.get(entry_record["device_name"], {})
+            named.pop(entry.entry_id, None)
+            if not named:
+                by_name.pop(entry_record["device_name"], None)
+            _remove_from_index(
+                domain_data,
+                DATA_BY_BATTERY,
+                coordinator.battery_entity,
+                entry_record,
+            )
 
-        # Unregister services if this was the last entry.
-        if not hass.data[DOMAIN]:
+        # Unregister services and drop the shared history if this was the last entry.
+        if not _entry_records(hass):
+            load_task = domain_data.pop(DATA_HISTORY_MANAGER, None)
+            if load_task is not None and load_task.done():
+                # History was saved above; stop the manager so it cannot
+                # overwrite a newer manager's stores at shutdown.
+                load_task.result().async_unload()
             await _unregister_services(hass)
 
     return unload_ok
 
 
+def _entry_records(hass: HomeAssistant) -> list[dict[str, Any]]:
+    """Return the loaded entry records, skipping secondary indexes."""
+    return [
+        data
+        for key, data in hass.data.get(DOMAIN, {}).items()
+        if key not in (DATA_BY_NAME, DATA_BY_BATTERY, DATA_HISTORY_MANAGER)
+    ]
+
+
+def _remove_from_index(
+    domain_data: dict[str, Any], index: str, key: str, entry_record: dict[str, Any]
+) -> None:
+    """Drop an index entry if it still points at the given entry record."""
+    lookup = domain_data.get(index, {})
+    if lookup.get(key) is entry_record:
+        del lookup[key]
+
+
+def _find_device_entry(
+    hass: HomeAssistant, entity_id: str | None, device_name: str | None
+) -> dict[str, Any]:
+    """Resolve an entry record by battery entity (preferred) or device name."""
+    domain_data = hass.data.get(DOMAIN, {})
+    if entity_id:
+        device_entry = domain_data.get(DATA_BY_BATTERY, {}).get(entity_id)
+        if not device_entry:
+            raise HomeAssistantError(
+                f"No SmartCharge device uses entity_id '{entity_id}'"
+            )
+        return device_entry
+
+    named = domain_data.get(DATA_BY_NAME, {}).get(device_name)
+    if not named:
+        raise HomeAssistantError(f"Device '{device_name}' not found")
+    if len(named) > 1:
+        raise HomeAssistantError(
+            f"Several devices are named '{device_name}'; pass entity_id instead"
+        )
+    return next(iter(named.values()))
+
+
 async def _register_services(hass: HomeAssistant) -> None:
     """Register integration services."""
     if hass.services.has_service(DOMAIN, SERVICE_RETRAIN):
@@ -190,29 +341,11 @@ async def _register_services(hass: HomeAssistant) -> None:
             )
 
         # Resolve device by entity_id (preferred) or device_name.
-        device_entry = None
-        if entity_id:
-            for _, data in hass.data[DOMAIN].items():
-                if data["coordinator"].config.get("battery_entity") == entity_id:
-                    device_entry = data
-                    break
-            if not device_entry:
-                raise HomeAssistantError(
-                    f"No SmartCharge device uses entity_id '{entity_id}'"
-                )
-        else:
-            for _, data in hass.data[DOMAIN].items():
-                if data["device_name"] == device_name:
-                    device_entry = data
-                    break
-            if not device_entry:
-                raise HomeAssistantError(f"Device '{device_name}' not found")
+        device_entry = _find_device_entry(hass, entity_id, device_name)
 
         try:
             # Check if learning is enabled.
-            if not device_entry["coordinator"].config.get(
-                CONF_LEARN_FROM_HISTORY, True
-            ):
+            if not device_entry["coordinator"].learn_from_history:
                 raise HomeAssistantError(
                     f"Learning from history is disabled for device '{device_entry['device_name']}'. "
                     "Enable it in integration options to retrain models."
@@ -225,31 +358,23 @@ async def _register_services(hass: HomeAssistant) -> None:
                 # Trigger coordinator refresh.
                 await device_entry["coordinator"].force_update()
 
-                # Show notification (non-blocking service call).
-                await hass.services.async_call(
-                    "persistent_notification",
-                    "create",
-                    {
-                        "message": f"Model retrained successfully for {device_entry['device_name']}",
-                        "title": "SmartCharge Predictor",
-                        "notification_id": f"smartcharge_retrain_{device_entry['device_name']}",
-                    },
-                    blocking=False,
+                # Show notification.
+                persistent_notification.async_create(
+                    hass,
+                    f"Model retrained successfully for {device_entry['device_name']}",
+                    title="SmartCharge Predictor",
+                    notification_id=f"smartcharge_retrain_{device_entry['device_name']}",
                 )
                 _LOGGER.info(
                     "Model retrained successfully for device: %s",
                     device_entry["device_name"],
                 )
             else:
-                await hass.services.async_call(
-                    "persistent_notification",
-                    "create",
-                    {
-                        "message": f"Failed to retrain model for {device_entry['device_name']}. Check logs for details.",
-                        "title": "SmartCharge Predictor",
-                        "notification_id": f"smartcharge_retrain_error_{device_entry['device_name']}",
-                    },
-                    blocking=False,
+                persistent_notification.async_create(
+                    hass,
+                    f"Failed to retrain model for {device_entry['device_name']}. Check logs for details.",
+                    title="SmartCharge Predictor",
+                    notification_id=f"smartcharge_retrain_error_{device_entry['device_name']}",
                 )
                 _LOGGER.warning(
                     "Failed to retrain model for device: %s",
@@ -263,18 +388,15 @@ async def _register_services(hass: HomeAssistant) -> None:
     async def export_data_service(call: ServiceCall) -> None:
         """Handle export data service call."""
         device_name = call.data.get("device_name")
-        if not device_name:
-            raise HomeAssistantError("device_name is required")
+        entity_id = call.data.get("entity_id")
+        if not device_name and not entity_id:
+            raise HomeAssistantError(
+                "Provide either entity_id (preferred) or device_name"
+            )
 
         # Find the device.
-        device_entry = None
-        for entry_id, data in hass.data[DOMAIN].items():
-            if data["device_name"] == device_name:
-                device_entry = data
-                break
-
-        if not device_entry:
-            raise HomeAssistantError(f"Device '{device_name}' not found")
+        device_entry = _find_device_entry(hass, entity_id, device_name)
+        device_name = device_entry["device_name"]
 
         try:
             # Export data.
@@ -283,15 +405,11 @@ async def _register_services(hass: HomeAssistant) -> None:
             )
 
             if filepath:
-                await hass.services.async_call(
-                    "persistent_notification",
-                    "create",
-                    {
-                        "message": f"Data exported successfully for {device_name} to: {filepath}",
-                        "title": "SmartCharge Predictor",
-                        "notification_id": f"smartcharge_export_{device_name}",
-                    },
-                    blocking=False,
+                persistent_notification.async_create(
+                    hass,
+                    f"Data exported successfully for {device_name} to: {filepath}",
+                    title="SmartCharge Predictor",
+                    notification_id=f"smartcharge_export_{device_name}",
                 )
                 _LOGGER.info(
                     "Data exported successfully for device: %s to %s",
@@ -299,15 +417,11 @@ async def _register_services(hass: HomeAssistant) -> None:
                     filepath,
                 )
             else:
-                await hass.services.async_call(
-                    "persistent_notification",
-                    "create",
-                    {
-                        "message": f"No data to export for {device_name}",
-                        "title": "SmartCharge Predictor",
-                        "notification_id": f"smartcharge_export_empty_{device_name}",
-                    },
-                    blocking=False,
+                persistent_notification.async_create(
+                    hass,
+                    f"No data to export for {device_name}",
+                    title="SmartCharge Predictor",
+                    notification_id=f"smartcharge_export_empty_{device_name}",
                 )
                 _LOGGER.warning("No data to export for device: %s", device_name)
 
@@ -328,169 +442,178 @@ async def _register_services(hass: HomeAssistant) -> None:
         else:
             start = now - timedelta(hours=48)
 
-        # Use first loaded entry.
-        if not hass.data.get(DOMAIN):
-            raise HomeAssistantError("Integration not initialized")
-        _, device_entry = next(iter(hass.data[DOMAIN].items()))
+        # Resolve the target device; only default when exactly one is loaded.
+        device_name = call.data.get("device_name")
+        entity_id = call.data.get("entity_id")
+        if device_name or entity_id:
+            device_entry = _find_device_entry(hass, entity_id, device_name)
+        else:
+            entry_records = _entry_records(hass)
+            if not entry_records:
+                raise HomeAssistantError("Integration not initialized")
+            if len(entry_records) > 1:
+                raise HomeAssistantError(
+                    "Multiple SmartCharge devices configured; "
+                    "provide entity_id (preferred) or device_name"
+                )
+            device_entry = entry_records[0]
 
         coordinator = device_entry["coordinator"]
         history_manager = device_entry["history_manager"]
-        config = coordinator.config
+        config = device_entry["config"]
         device_id = coordinator.device_id
-        battery_entity = config[CONF_BATTERY_ENTITY]
+        battery_entity = coordinator.battery_entity
         temp_entity = config.get(CONF_AMBIENT_TEMP_ENTITY)
         humid_entity = config.get(CONF_HUMIDITY_ENTITY)
 
         # Recorder history API must be run in executor.
-        from homeassistant.components.recorder import history as recorder_history  # noqa: PLC0415
-
-        def _fetch_states():
-            changes_map: dict[str, list] = {}
+        recorder_history = _get_recorder_history()
+
+        def _numeric_pairs(lst):
+            """Return chronological (timestamp, value) pairs, skipping non-numeric states."""
+            # Resolve each state's timestamp once, then sort on it.
+            pairs = []
+            append = pairs.append
+            for st in lst:
+                try:
+                    value = float(st.state)
+                except (ValueError, TypeError):
+                    continue
+                append((st.last_changed or st.last_updated or now, value))
+            pairs.sort(key=itemgetter(0))
+            return pairs
 
+        def _fetch_states(entity_id: str) -> tuple[int, list]:
             # Use state_changes_during_period for maximum fidelity of numeric steps.
             # Note: state_changes_during_period only accepts a single entity_id (singular).
             # So we need to call it once per entity.
-            batt_result = recorder_history.state_changes_during_period(  # type: ignore[attr-defined]
+            result = recorder_history.state_changes_during_period(  # type: ignore[attr-defined]
                 hass,
                 start_time=start,
                 end_time=now,
-                entity_id=battery_entity,
+                entity_id=entity_id,
                 no_attributes=True,
             )
-            changes_map.update(batt_result)
+            # Reduce State objects to primitive pairs before leaving the executor
+            # so the recorder's State wrappers are released immediately.
+            states = result.get(entity_id, [])
+            return len(states), _numeric_pairs(states)
+
+        async def _async_fetch_states(entity_id: str | None) -> tuple[int, list]:
+            if not entity_id:
+                return 0, []
+            return await hass.async_add_executor_job(_fetch_states, entity_id)
+
+        # The per-entity queries are independent, so run them concurrently.
+        (
+            (batt_state_count, readings),
+            (_, temp_pairs),
+            (_, humid_pairs),
+        ) = await asyncio.gather(
+            _async_fetch_states(battery_entity),
+            _async_fetch_states(temp_entity),
+            _async_fetch_states(humid_entity),
+        )
+        if not batt_state_count:
+            raise HomeAssistantError("No recorder history found for battery entity")
 
-            if temp_entity:
-                temp_result = recorder_history.state_changes_during_period(  # type: ignore[attr-defined]
-                    hass,
-                    start_time=start,
-                    end_time=now,
-                    entity_id=temp_entity,
-                    no_attributes=True,
+        def _value_at(timestamps, values, ts):
+            """Return the last numeric value recorded at or before ts."""
+            idx = bisect_right(timestamps, ts) - 1
+            return values[idx] if idx >= 0 else None
+
+        def _build_samples():
+            """Build import sample tuples; runs in the executor, touches no shared state."""
+            samples = []
+            no_change_count = 0
+            decrease_count = 0
+            if not readings:
+                return samples, no_change_count, decrease_count
+
+            append = samples.append
+            # Parallel timestamp/value lists for bisect lookups.
+            temp_ts = [ts for ts, _ in temp_pairs]
+            temp_vals = [value for _, value in temp_pairs]
+            humid_ts = [ts for ts, _ in humid_pairs]
+            humid_vals = [value for _, value in humid_pairs]
+            # Decide once whether optional sensors have data (often not configured).
+            has_temp = bool(temp_ts)
+            has_humid = bool(humid_ts)
+
+            # Record sample for any change (matches normal operation behavior).
+            # Normal operation records all changes and sets rate_pct_per_min=None for decreases.
+            # Training filters out None rates, so decreases don't affect training.
+
+            # First sample - record it with no rate.
+            ts, pct = readings[0]
+            append(
+                (
+                    ts,
+                    pct,
+                    _value_at(temp_ts, temp_vals, ts) if has_temp else None,
+                    _value_at(humid_ts, humid_vals, ts) if has_humid else None,
+                    None,
                 )
-                changes_map.update(temp_result)
+            )
 
-            if humid_entity:
-                humid_result = recorder_history.state_changes_during_period(  # type: ignore[attr-defined]
-                    hass,
-                    start_time=start,
-                    end_time=now,
-                    entity_id=humid_entity,
-                    no_attributes=True,
-                )
-                changes_map.update(humid_result)
+            for (prev_ts, prev_pct), (ts, pct) in pairwise(readings):
+                minutes = (ts - prev_ts).total_seconds() / 60.0
+                if minutes <= 0:
+                    # Skip if time difference is invalid.
+                    continue
 
-            # Ensure chronological order.
-            def _sorted_list(lst):
-                return sorted(
-                    lst,
-                    key=lambda s: (s.last_changed or s.last_updated or now),
+                # Calculate rate (can be positive, zero, or negative).
+                rate = (pct - prev_pct) / minutes
+                temp_val = _value_at(temp_ts, temp_vals, ts) if has_temp else None
+                humid_val = _value_at(humid_ts, humid_vals, ts) if has_humid else None
+                append(
+                    (
+                        ts,
+                        pct,
+                        temp_val,
+                        humid_val,
+                        # None for decreases/same (like normal operation).
+                        rate if rate > 0 else None,
+                    )
                 )
+                if pct == prev_pct:
+                    no_change_count += 1
+                elif pct < prev_pct:
+                    decrease_count += 1
 
-            return (
-                _sorted_list(changes_map.get(battery_entity, [])),
-                _sorted_list(changes_map.get(temp_entity, [])) if temp_entity else [],
-                _sorted_list(changes_map.get(humid_entity, [])) if humid_entity else [],
-            )
+            return samples, no_change_count, decrease_count
 
-        batt_states, temp_states, humid_states = await hass.async_add_executor_job(
-            _fetch_states
+        # Build samples off the event loop; history is only mutated on the loop.
+        # Rows without a numeric state import zero samples rather than failing.
+        samples, no_change_count, decrease_count = await hass.async_add_executor_job(
+            _build_samples
         )
-        if not batt_states:
-            raise HomeAssistantError("No recorder history found for battery entity")
 
         _LOGGER.debug(
             "Importer fetched %s battery state rows (%s to %s)",
-            len(batt_states),
+            batt_state_count,
             start.isoformat(),
             now.isoformat(),
         )
 
-        def _value_at(states_list, ts):
-            last_val = None
-            for st in states_list:
-                ref_ts = st.last_changed or st.last_updated
-                if ref_ts and ref_ts <= ts:
-                    try:
-                        last_val = float(st.state)
-                    except Exception:
-                        continue
-                else:
-                    break
-            return last_val
-
         # Always clear existing samples in the selected window before import.
+        # Clearing and recording only touch in-memory history; the single save
+        # below persists both, so nothing may save in between.
         history_manager.clear_history_for_period(device_id, start, now)
         _LOGGER.debug(
             "Cleared history for device %s from %s to %s", device_id, start, now
         )
 
-        prev = None
-        imported = 0
-        considered = 0
-        no_change_count = 0
-        decrease_count = 0
-        for st in batt_states:
-            try:
-                ts = st.last_changed or st.last_updated or now
-                pct = float(st.state)
-            except Exception:
-                continue
-            considered += 1
-            if prev is not None:
-                prev_ts, prev_pct = prev
-                minutes = (ts - prev_ts).total_seconds() / 60.0
-                if minutes <= 0:
-                    # Skip if time difference is invalid.
-                    prev = (ts, pct)
-                    continue
-
-                # Calculate rate (can be positive, zero, or negative).
-                rate = (pct - prev_pct) / minutes
-
-                # Record sample for any change (matches normal operation behavior).
-                # Normal operation records all changes and sets rate_pct_per_min=None for decreases.
-                # Training filters out None rates, so decreases don't affect training.
-                temp_val = _value_at(temp_states, ts) if temp_states else None
-                humid_val = _value_at(humid_states, ts) if humid_states else None
-                history_manager.record_sample(
-                    device_id=device_id,
-                    battery_pct=pct,
-                    temperature=temp_val,
-                    humidity=humid_val,
-                    rate_pct_per_min=rate
-                    if rate > 0
-                    else None,  # None for decreases/same (like normal operation).
-                    charger_power_w=config.get(CONF_CHARGER_POWER, 20.0),
-                    optimized_charging=bool(
-                        config.get(CONF_OPTIMIZED_CHARGING_ENABLED, False)
-                    ),
-                    battery_health=config.get(CONF_BATTERY_HEALTH, 100.0),
-                )
-                imported += 1
-                if pct == prev_pct:
-                    no_change_count += 1
-                elif pct < prev_pct:
-                    decrease_count += 1
-            else:
-                # First sample - record it with no rate.
-                temp_val = _value_at(temp_states, ts) if temp_states else None
-                humid_val = _value_at(humid_states, ts) if humid_states else None
-                history_manager.record_sample(
-                    device_id=device_id,
-                    battery_pct=pct,
-                    temperature=temp_val,
-                    humidity=humid_val,
-                    rate_pct_per_min=None,  # No rate for first sample.
-                    charger_power_w=config.get(CONF_CHARGER_POWER, 20.0),
-                    optimized_charging=bool(
-                        config.get(CONF_OPTIMIZED_CHARGING_ENABLED, False)
-                    ),
-                    battery_health=config.get(CONF_BATTERY_HEALTH, 100.0),
-                )
-                imported += 1
-            prev = (ts, pct)
+        imported = history_manager.record_samples(
+            device_id,
+            samples,
+            charger_power_w=config.get(CONF_CHARGER_POWER, 20.0),
+            optimized_charging=bool(config.get(CONF_OPTIMIZED_CHARGING_ENABLED, False)),
+            battery_health=config.get(CONF_BATTERY_HEALTH, 100.0),
+        )
 
-        await history_manager.async_save(immediate=True)
+        # One debounced save for the whole import (shutdown flushes it anyway).
+        await history_manager.async_save()
         increases = (
             imported - no_change_count - decrease_count - 1
         )  # Subtract no-change, decrease samples and first sample.
@@ -498,20 +621,16 @@ async def _register_services(hass: HomeAssistant) -> None:
             "Import complete for %s: imported %s samples from %s history rows (%s increases, %s no-change, %s decreases)",
             device_entry["device_name"],
             imported,
-            len(batt_states),
+            batt_state_count,
             increases,
             no_change_count,
             decrease_count,
         )
-        await hass.services.async_call(
-            "persistent_notification",
-            "create",
-            {
-                "message": f"Imported {imported} historical samples for {device_entry['device_name']}",
-                "title": "SmartCharge Predictor",
-                "notification_id": f"smartcharge_import_{device_id}",
-            },
-            blocking=False,
+        persistent_notification.async_create(
+            hass,
+            f"Imported {imported} historical samples for {device_entry['device_name']}",
+            title="SmartCharge Predictor",
+            notification_id=f"smartcharge_import_{device_id}",
         )
 
     # Register services.
@@ -533,7 +652,8 @@ async def _register_services(hass: HomeAssistant) -> None:
         export_data_service,
         schema=vol.Schema(
             {
-                vol.Required("device_name"): str,
+                vol.Optional("entity_id"): str,
+                vol.Optional("device_name"): str,
             }
         ),
     )
@@ -544,6 +664,8 @@ async def _register_services(hass: HomeAssistant) -> None:
         import_history_service,
         schema=vol.Schema(
             {
+                vol.Optional("entity_id"): str,
+                vol.Optional("device_name"): str,
                 vol.Optional("hours"): vol.All(vol.Coerce(int), vol.Range(min=1)),
                 vol.Optional("days"): vol.All(vol.Coerce(int), vol.Range(min=1)),
             }
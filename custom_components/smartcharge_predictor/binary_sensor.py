@@ -10,7 +10,7 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
@@ -59,16 +59,22 @@ class OptimizedChargingBinarySensor(
             sw_version=INTEGRATION_VERSION,
         )
 
-    @property
-    def is_on(self) -> bool | None:
-        """Return if optimized charging is active."""
-        if not self.coordinator.data:
-            return None
-        return self.coordinator.data.get("optimized_charging")
+        self._update_from_coordinator()
+
+    @callback
+    def _update_from_coordinator(self) -> None:
+        """Cache state and availability from the latest coordinator data."""
+        data = self.coordinator.data
+        self._attr_is_on = data.get("optimized_charging") if data else None
+        self._attr_available = self.coordinator.last_update_success and data is not None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._update_from_coordinator()
+        super()._handle_coordinator_update()
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return (
-            self.coordinator.last_update_success and self.coordinator.data is not None
-        )
+        return self._attr_available
@@ -46,16 +46,37 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# Shared field validators
+CHARGER_POWER_VALIDATOR = vol.All(vol.Coerce(float), vol.Range(min=1.0, max=1000.0))
+BATTERY_HEALTH_VALIDATOR = vol.All(vol.Coerce(float), vol.Range(min=1.0, max=100.0))
+SCAN_INTERVAL_VALIDATOR = vol.All(vol.Coerce(int), vol.Range(min=30, max=300))
+MAX_HISTORY_SAMPLES_VALIDATOR = vol.All(
+    vol.Coerce(int),
+    vol.Range(min=MIN_MAX_HISTORY_SAMPLES, max=MAX_MAX_HISTORY_SAMPLES),
+)
+
+# Configuration schema for user step
+USER_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_BATTERY_ENTITY): selector.EntitySelector(
+            selector.EntitySelectorConfig(
+                domain=["sensor"],
+                device_class="battery",
+            )
+        ),
+    }
+)
+
 # Configuration schema for device details step
 DEVICE_DETAILS_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_DEVICE_NAME): str,
-        vol.Required(CONF_CHARGER_POWER, default=DEFAULT_CHARGER_POWER): vol.All(
-            vol.Coerce(float), vol.Range(min=1.0, max=1000.0)
-        ),
-        vol.Required(CONF_BATTERY_HEALTH, default=DEFAULT_BATTERY_HEALTH): vol.All(
-            vol.Coerce(float), vol.Range(min=1.0, max=100.0)
-        ),
+        vol.Required(
+            CONF_CHARGER_POWER, default=DEFAULT_CHARGER_POWER
+        ): CHARGER_POWER_VALIDATOR,
+        vol.Required(
+            CONF_BATTERY_HEALTH, default=DEFAULT_BATTERY_HEALTH
+        ): BATTERY_HEALTH_VALIDATOR,
         vol.Required(CONF_LEARN_FROM_HISTORY, default=True): bool,
     }
 )
@@ -83,6 +104,13 @@ ENVIRONMENT_SCHEMA = vol.Schema(
     }
 )
 
+# Optional entities validated by the environment step
+_ENV_ENTITY_KEYS = (
+    CONF_AMBIENT_TEMP_ENTITY,
+    CONF_HUMIDITY_ENTITY,
+    CONF_OPTIMIZED_CHARGING_ENTITY,
+)
+
 # Configuration schema for optimized charging step (boolean setting)
 OPTIMIZED_CHARGING_SCHEMA = vol.Schema(
     {vol.Required(CONF_OPTIMIZED_CHARGING_ENABLED, default=False): bool}
@@ -97,6 +125,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     def __init__(self) -> None:
         """Initialize the config flow."""
         self._data: dict[str, Any] = {}
+        self._entity_registry: er.EntityRegistry | None = None
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -105,16 +134,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is None:
             return self.async_show_form(
                 step_id=STEP_USER,
-                data_schema=vol.Schema(
-                    {
-                        vol.Required(CONF_BATTERY_ENTITY): selector.EntitySelector(
-                            selector.EntitySelectorConfig(
-                                domain=["sensor"],
-                                device_class="battery",
-                            )
-                        ),
-                    }
-                ),
+                data_schema=USER_SCHEMA,
                 errors={},
             )
 
@@ -123,16 +143,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if not await self._validate_entity(battery_entity):
             return self.async_show_form(
                 step_id=STEP_USER,
-                data_schema=vol.Schema(
-                    {
-                        vol.Required(CONF_BATTERY_ENTITY): selector.EntitySelector(
-                            selector.EntitySelectorConfig(
-                                domain=["sensor"],
-                                device_class="battery",
-                            )
-                        ),
-                    }
-                ),
+                data_schema=USER_SCHEMA,
                 errors={CONF_BATTERY_ENTITY: ERROR_INVALID_ENTITY},
             )
 
@@ -176,31 +187,18 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             )
 
         # Validate optional entities if provided
-        if user_input.get(CONF_AMBIENT_TEMP_ENTITY):
-            if not await self._validate_entity(user_input[CONF_AMBIENT_TEMP_ENTITY]):
-                return self.async_show_form(
-                    step_id=STEP_ENVIRONMENT,
-                    data_schema=ENVIRONMENT_SCHEMA,
-                    errors={CONF_AMBIENT_TEMP_ENTITY: ERROR_INVALID_ENTITY},
-                )
-
-        if user_input.get(CONF_HUMIDITY_ENTITY):
-            if not await self._validate_entity(user_input[CONF_HUMIDITY_ENTITY]):
-                return self.async_show_form(
-                    step_id=STEP_ENVIRONMENT,
-                    data_schema=ENVIRONMENT_SCHEMA,
-                    errors={CONF_HUMIDITY_ENTITY: ERROR_INVALID_ENTITY},
-                )
-
-        if user_input.get(CONF_OPTIMIZED_CHARGING_ENTITY):
-            if not await self._validate_entity(
-                user_input[CONF_OPTIMIZED_CHARGING_ENTITY]
-            ):
-                return self.async_show_form(
-                    step_id=STEP_ENVIRONMENT,
-                    data_schema=ENVIRONMENT_SCHEMA,
-                    errors={CONF_OPTIMIZED_CHARGING_ENTITY: ERROR_INVALID_ENTITY},
-                )
+        errors: dict[str, str] = {}
+        for key in _ENV_ENTITY_KEYS:
+            entity_id = user_input.get(key)
+            if entity_id and not await self._validate_entity(entity_id):
+                errors[key] = ERROR_INVALID_ENTITY
+
+        if errors:
+            return self.async_show_form(
+                step_id=STEP_ENVIRONMENT,
+                data_schema=ENVIRONMENT_SCHEMA,
+                errors=errors,
+            )
 
         self._data.update(user_input)
         return await self.async_step_optimized_charging()
@@ -233,11 +231,13 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     async def _validate_entity(self, entity_id: str) -> bool:
         """Validate that an entity exists and is accessible."""
-        try:
-            entity_registry = er.async_get(self.hass)
-            return entity_registry.async_get(entity_id) is not None
-        except Exception:
-            return False
+        # Fast path: any entity with a current state exists.
+        if self.hass.states.get(entity_id) is not None:
+            return True
+
+        if self._entity_registry is None:
+            self._entity_registry = er.async_get(self.hass)
+        return self._entity_registry.async_get(entity_id) is not None
 
     @staticmethod
     @callback
@@ -269,13 +269,13 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                     default=self.config_entry.data.get(
                         CONF_CHARGER_POWER, DEFAULT_CHARGER_POWER
                     ),
-                ): vol.All(vol.Coerce(float), vol.Range(min=1.0, max=1000.0)),
+                ): CHARGER_POWER_VALIDATOR,
                 vol.Optional(
                     CONF_BATTERY_HEALTH,
                     default=self.config_entry.data.get(
                         CONF_BATTERY_HEALTH, DEFAULT_BATTERY_HEALTH
                     ),
-                ): vol.All(vol.Coerce(float), vol.Range(min=1.0, max=100.0)),
+                ): BATTERY_HEALTH_VALIDATOR,
                 vol.Optional(
                     CONF_LEARN_FROM_HISTORY,
                     default=self.config_entry.data.get(CONF_LEARN_FROM_HISTORY, True),
@@ -288,7 +288,7 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                             CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL_SECONDS
                         ),
                     ),
-                ): vol.All(vol.Coerce(int), vol.Range(min=30, max=300)),
+                ): SCAN_INTERVAL_VALIDATOR,
                 vol.Optional(
                     CONF_MAX_HISTORY_SAMPLES,
                     default=self.config_entry.options.get(
@@ -297,10 +297,7 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                             CONF_MAX_HISTORY_SAMPLES, DEFAULT_MAX_HISTORY_SAMPLES
                         ),
                     ),
-                ): vol.All(
-                    vol.Coerce(int),
-                    vol.Range(min=MIN_MAX_HISTORY_SAMPLES, max=MAX_MAX_HISTORY_SAMPLES),
-                ),
+                ): MAX_HISTORY_SAMPLES_VALIDATOR,
             }
         )
 
@@ -54,6 +54,16 @@ UNIT_MINUTES = "min"
 
 # ML training
 MIN_SAMPLES_FOR_TRAINING = 20
+# Full updates between retrain checks when no new sample was recorded
+RETRAIN_CHECK_EVERY_N_TICKS = 10
+# Minimum time between automatic retrains
+RETRAIN_INTERVAL_SECONDS = 86400
+# Relative shift in the mean charge rate since training that justifies a retrain
+RETRAIN_MIN_DRIFT = 0.05
+# New samples, as a fraction of the training samples, that justify a retrain
+RETRAIN_MIN_NEW_FRACTION = 0.1
+# Retrain intervals that may be skipped in a row before retraining anyway
+RETRAIN_MAX_SKIPPED_INTERVALS = 7
 ML_MODEL_TYPE = "learned"
 EMPIRICAL_MODEL_TYPE = "empirical"
 
@@ -3,15 +3,28 @@
 from __future__ import annotations
 
 import logging
+import time
 from collections.abc import Callable
 from datetime import datetime, timedelta
+from functools import cached_property
 from typing import Any, Optional
 
+from homeassistant.const import STATE_OFF, STATE_ON, STATE_UNAVAILABLE, STATE_UNKNOWN
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
 
 from .const import (
+    ATTR_BATTERY_HEALTH,
+    ATTR_CHARGER_POWER,
+    ATTR_HUMIDITY,
+    ATTR_LAST_TRAINING,
+    ATTR_LAST_UPDATED,
+    ATTR_MODEL_TYPE,
+    ATTR_OPTIMIZED_CHARGING,
+    ATTR_TEMPERATURE,
+    ATTR_TIME_REMAINING_MINUTES,
     CONF_AMBIENT_TEMP_ENTITY,
     CONF_BATTERY_ENTITY,
     CONF_BATTERY_HEALTH,
@@ -25,12 +38,52 @@ from .const import (
     DOMAIN,
     FAST_CHARGE_THRESHOLD,
     INTEGRATION_VERSION,
+    RETRAIN_CHECK_EVERY_N_TICKS,
 )
 from .history_manager import HistoryManager
 from .model import ChargingModel
 
 _LOGGER = logging.getLogger(__name__)
 
+# Entity states that carry no usable value.
+_UNAVAILABLE_STATES = frozenset((STATE_UNKNOWN, STATE_UNAVAILABLE))
+_TRUTHY_STATES = frozenset(("on", "true", "1"))
+
+# Sensor attribute name -> source key, for coordinator data and model info.
+_COMMON_ATTRS = (
+    (ATTR_TEMPERATURE, "temperature"),
+    (ATTR_HUMIDITY, "humidity"),
+    (ATTR_CHARGER_POWER, "charger_power_w"),
+    (ATTR_BATTERY_HEALTH, "battery_health"),
+    (ATTR_OPTIMIZED_CHARGING, "optimized_charging"),
+    (ATTR_LAST_UPDATED, "last_updated"),
+)
+_COMMON_MODEL_ATTRS = (
+    (ATTR_MODEL_TYPE, "model_type"),
+    (ATTR_LAST_TRAINING, "last_training"),
+)
+_RATE_ATTRS = (
+    ("calculated_rate", "calculated_rate"),
+    ("battery_pct", "battery_pct"),
+)
+_RATE_MODEL_ATTRS = (
+    ("model_accuracy", "accuracy"),
+    ("sample_count", "sample_count"),
+)
+_FULL_CHARGE_ATTRS = (
+    (ATTR_TIME_REMAINING_MINUTES, "time_remaining"),
+    (ATTR_LAST_UPDATED, "last_updated"),
+)
+
+
+def _pick_attrs(
+    source: dict[str, Any], attr_map: tuple[tuple[str, str], ...]
+) -> dict[str, Any]:
+    """Map source values to attribute names, dropping None values."""
+    return {
+        attr: value for attr, key in attr_map if (value := source.get(key)) is not None
+    }
+
 
 class SmartChargeCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """Coordinator for SmartCharge Predictor data updates."""
@@ -49,13 +102,35 @@ class SmartChargeCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self.history_manager = history_manager
         self.charging_model = charging_model
 
+        # Resolved config values (options changes reload the entry).
+        self.battery_entity: str = config[CONF_BATTERY_ENTITY]
+        self.learn_from_history = bool(config.get(CONF_LEARN_FROM_HISTORY, True))
+        self._temp_entity: str | None = config.get(CONF_AMBIENT_TEMP_ENTITY)
+        self._humidity_entity: str | None = config.get(CONF_HUMIDITY_ENTITY)
+        self._optimized_charging_entity: str | None = config.get(
+            CONF_OPTIMIZED_CHARGING_ENTITY
+        )
+        self._optimized_charging_enabled = bool(
+            config.get(CONF_OPTIMIZED_CHARGING_ENABLED, False)
+        )
+        self._charger_power_w = config.get(CONF_CHARGER_POWER, 20.0)
+        self._battery_health = config.get(CONF_BATTERY_HEALTH, 100.0)
+
         # Track previous battery level for rate calculation.
         self._previous_battery_pct: Optional[float] = None
         self._previous_timestamp: Optional[datetime] = None
+        # Prediction inputs from the last full update.
+        self._previous_inputs: tuple[Any, ...] | None = None
 
         # Cache last known data for graceful error handling.
         self._last_known_data: Optional[dict[str, Any]] = None
         self._state_listener: Optional[Callable[[], None]] = None
+        self._ticks_since_retrain_check = 0
+        # Set by battery state changes; scheduled refreshes never reuse data.
+        self._state_refresh_pending = False
+
+        # History version and result of the last "stuck near 80%" inference.
+        self._optimized_inference_cache: tuple[int, bool] | None = None
 
         # Determine scan interval from config (already merged with options in __init__.py).
         scan_interval_seconds = config.get(
@@ -76,13 +151,14 @@ class SmartChargeCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     @callback
     def _setup_state_listener(self) -> None:
         """Set up state change listener for battery entity."""
-        battery_entity = self.config.get(CONF_BATTERY_ENTITY)
+        battery_entity = self.battery_entity
         if not battery_entity:
             return
 
         @callback
         def _async_battery_state_changed(event) -> None:
             """Handle battery state changes."""
+            self._state_refresh_pending = True
             self.async_request_refresh()
 
         self._state_listener = async_track_state_change_event(
@@ -98,13 +174,15 @@ class SmartChargeCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Update data from entities and calculate predictions."""
+        state_refresh = self._state_refresh_pending
+        self._state_refresh_pending = False
         try:
             # Get current battery level.
-            battery_entity = self.config[CONF_BATTERY_ENTITY]
+            battery_entity = self.battery_entity
             _LOGGER.debug("Reading battery entity: %s", battery_entity)
             battery_state = self.hass.states.get(battery_entity)
 
-            if not battery_state or battery_state.state in ("unknown", "unavailable"):
+            if not battery_state or battery_state.state in _UNAVAILABLE_STATES:
                 _LOGGER.debug(
                     "Battery entity %s unavailable (state: %s)",
                     battery_entity,
@@ -130,8 +208,8 @@ class SmartChargeCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 return {}
 
             # Get optional sensor values.
-            temperature = await self._get_sensor_value(CONF_AMBIENT_TEMP_ENTITY)
-            humidity = await self._get_sensor_value(CONF_HUMIDITY_ENTITY)
+            temperature = self._get_sensor_value(self._temp_entity)
+            humidity = self._get_sensor_value(self._humidity_entity)
             _LOGGER.debug(
                 "Sensors -> battery_pct=%s temp=%s humidity=%s",
                 battery_pct,
@@ -140,12 +218,38 @@ class SmartChargeCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             )
 
             # Get optimized charging status (from entity if configured, else infer from behavior).
-            optimized_charging = await self._get_optimized_charging_status(battery_pct)
+            optimized_charging = self._get_optimized_charging_status(battery_pct)
             _LOGGER.debug("Optimized charging enabled: %s", optimized_charging)
 
+            # Reuse the last prediction when a state change altered nothing that
+            # feeds it since a full update within the current scan interval.
+            # Scheduled refreshes always run in full: Home Assistant schedules
+            # them slightly early, which would skip every other interval.
+            now = dt_util.utcnow()
+            inputs = (
+                battery_pct,
+                temperature,
+                humidity,
+                optimized_charging,
+                self.charging_model.last_training,
+            )
+            if (
+                state_refresh
+                and self._last_known_data
+                and inputs == self._previous_inputs
+                and self._previous_timestamp is not None
+                and self.update_interval is not None
+                and now - self._previous_timestamp < self.update_interval
+            ):
+                _LOGGER.debug("Inputs unchanged, reusing last prediction")
+                data = {**self._last_known_data, "last_updated": now.isoformat()}
+                self._add_sensor_attributes(data)
+                self._last_known_data = data
+                return data
+
             # Get charger and battery health from config.
-            charger_power_w = self.config.get(CONF_CHARGER_POWER, 20.0)
-            battery_health = self.config.get(CONF_BATTERY_HEALTH, 100.0)
+            charger_power_w = self._charger_power_w
+            battery_health = self._battery_health
 
             # Calculate charging rate from previous sample if available.
             calculated_rate = self.history_manager.calculate_rate_from_samples(
@@ -154,7 +258,8 @@ class SmartChargeCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
             # Record a sample when the reported battery percent changes.
             # Only record if learn_from_history is enabled.
-            learn_from_history = self.config.get(CONF_LEARN_FROM_HISTORY, True)
+            learn_from_history = self.learn_from_history
+            sample_recorded = False
             if learn_from_history:
                 latest_sample = self.history_manager.get_latest_sample(self.device_id)
                 latest_pct = latest_sample.get("battery_pct") if latest_sample else None
@@ -169,6 +274,7 @@ class SmartChargeCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                         optimized_charging=optimized_charging,
                         battery_health=battery_health,
                     )
+                    sample_recorded = True
 
             # Predict charging rate using model.
             predicted_rate = self.charging_model.predict_rate(
@@ -189,13 +295,22 @@ class SmartChargeCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             )
 
             # Check if we should retrain the model (only if learning is enabled).
-            if learn_from_history and self.charging_model.should_retrain():
-                _LOGGER.info("Retraining model for device %s", self.device_id)
-                await self.charging_model.train_model()
+            # The check runs when a new sample arrives or every few updates.
+            if learn_from_history:
+                self._ticks_since_retrain_check += 1
+                if (
+                    sample_recorded
+                    or self._ticks_since_retrain_check >= RETRAIN_CHECK_EVERY_N_TICKS
+                ):
+                    self._ticks_since_retrain_check = 0
+                    if self.charging_model.should_retrain():
+                        _LOGGER.info("Retraining model for device %s", self.device_id)
+                        await self.charging_model.train_model()
 
             # Update previous values for next calculation.
             self._previous_battery_pct = battery_pct
-            self._previous_timestamp = datetime.now()
+            self._previous_timestamp = now
+            self._previous_inputs = inputs
 
             # Prepare data for sensors.
             data = {
@@ -209,10 +324,11 @@ class SmartChargeCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 "calculated_rate": calculated_rate,
                 "time_remaining": time_remaining_minutes,
                 "full_charge_time": full_charge_time,
-                "last_updated": datetime.now().isoformat(),
+                "last_updated": now.isoformat(),
                 "model_info": self.charging_model.get_model_info(),
             }
             _LOGGER.debug("Coordinator data prepared: %s", data)
+            self._add_sensor_attributes(data)
 
             # Cache last known data for graceful error handling.
             self._last_known_data = data
@@ -231,14 +347,28 @@ class SmartChargeCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             # If no previous data and error occurred, return empty dict.
             return {}
 
-    async def _get_sensor_value(self, config_key: str) -> Optional[float]:
+    @staticmethod
+    def _add_sensor_attributes(data: dict[str, Any]) -> None:
+        """Build the sensors' state attributes once per update."""
+        model_info = data.get("model_info") or {}
+        common = _pick_attrs(data, _COMMON_ATTRS)
+        common.update(_pick_attrs(model_info, _COMMON_MODEL_ATTRS))
+
+        data["attrs_time_remaining"] = common
+        data["attrs_full_charge"] = _pick_attrs(data, _FULL_CHARGE_ATTRS)
+        data["attrs_predicted_rate"] = {
+            **_pick_attrs(data, _RATE_ATTRS),
+            **common,
+            **_pick_attrs(model_info, _RATE_MODEL_ATTRS),
+        }
+
+    def _get_sensor_value(self, entity_id: str | None) -> float | None:
         """Get numeric value from an optional sensor entity."""
-        entity_id = self.config.get(config_key)
         if not entity_id:
             return None
 
         state = self.hass.states.get(entity_id)
-        if not state or state.state in ("unknown", "unavailable"):
+        if not state or state.state in _UNAVAILABLE_STATES:
             return None
 
         try:
@@ -247,30 +377,35 @@ class SmartChargeCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             _LOGGER.warning("Invalid numeric value from %s: %s", entity_id, state.state)
             return None
 
-    async def _get_binary_sensor_value(self, entity_id: str) -> Optional[bool]:
+    def _get_binary_sensor_value(self, entity_id: str) -> bool | None:
         """Get boolean value from a binary sensor entity."""
         if not entity_id:
             return None
 
         state = self.hass.states.get(entity_id)
-        if not state or state.state in ("unknown", "unavailable"):
+        if not state or state.state in _UNAVAILABLE_STATES:
             return None
 
-        return state.state.lower() in ("on", "true", "1")
+        value = state.state
+        # Binary sensors report canonical "on"/"off"; only other entity
+        # types need the case-insensitive fallback.
+        if value == STATE_ON:
+            return True
+        if value == STATE_OFF:
+            return False
+        return value.lower() in _TRUTHY_STATES
 
-    async def _get_optimized_charging_status(self, battery_pct: float) -> bool:
+    def _get_optimized_charging_status(self, battery_pct: float) -> bool:
         """Get optimized charging status from entity or infer from behavior."""
         # First, try to read from configured entity.
-        optimized_charging_entity = self.config.get(CONF_OPTIMIZED_CHARGING_ENTITY)
+        optimized_charging_entity = self._optimized_charging_entity
         if optimized_charging_entity:
-            entity_value = await self._get_binary_sensor_value(
-                optimized_charging_entity
-            )
+            entity_value = self._get_binary_sensor_value(optimized_charging_entity)
             if entity_value is not None:
                 return entity_value
 
         # Fall back to config boolean setting.
-        if self.config.get(CONF_OPTIMIZED_CHARGING_ENABLED, False):
+        if self._optimized_charging_enabled:
             return True
 
         # Infer from battery behavior: stuck near 80% for extended period.
@@ -278,18 +413,24 @@ class SmartChargeCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             battery_pct >= FAST_CHARGE_THRESHOLD - 2
             and battery_pct <= FAST_CHARGE_THRESHOLD + 2
         ):
-            # Check if battery has been stuck in this range.
+            # Check if battery has been stuck in this range. The result only
+            # depends on the history, so reuse it until the history changes.
+            version = self.history_manager.get_history_version(self.device_id)
+            cache = self._optimized_inference_cache
+            if cache is not None and cache[0] == version:
+                return cache[1]
+
             history = self.history_manager.get_history(self.device_id)
-            if len(history) >= 3:
-                recent_samples = history[-3:]
-                if all(
-                    FAST_CHARGE_THRESHOLD - 2
-                    <= s.get("battery_pct", 0)
-                    <= FAST_CHARGE_THRESHOLD + 2
-                    for s in recent_samples
-                ):
-                    # Battery stuck near 80%, likely optimized charging.
-                    return True
+            stuck = len(history) >= 3 and all(
+                FAST_CHARGE_THRESHOLD - 2
+                <= history[-i].get("battery_pct", 0)
+                <= FAST_CHARGE_THRESHOLD + 2
+                for i in (1, 2, 3)
+            )
+            self._optimized_inference_cache = (version, stuck)
+            if stuck:
+                # Battery stuck near 80%, likely optimized charging.
+                return True
 
         return False
 
@@ -314,29 +455,17 @@ class SmartChargeCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         rate = latest_sample.get("rate_pct_per_min")
         if rate is not None and rate > 0:
             # Check if sample is recent (within last 5 minutes).
-            try:
-                timestamp_str = latest_sample.get("timestamp")
-                if timestamp_str:
-                    timestamp = datetime.fromisoformat(timestamp_str)
-                    time_diff = (datetime.now() - timestamp).total_seconds()
-                    if time_diff < 300:  # 5 minutes
-                        return True
-            except (ValueError, TypeError):
-                pass
+            latest_epoch = self.history_manager.get_latest_sample_epoch(self.device_id)
+            if latest_epoch is not None and time.time() - latest_epoch < 300:
+                return True
 
         # Check if battery percentage is increasing based on recent samples.
         history = self.history_manager.get_history(self.device_id)
         if len(history) >= 2:
-            recent_samples = history[-2:]
-            if len(recent_samples) == 2:
-                prev_pct = recent_samples[0].get("battery_pct")
-                curr_pct = recent_samples[1].get("battery_pct")
-                if (
-                    prev_pct is not None
-                    and curr_pct is not None
-                    and curr_pct > prev_pct
-                ):
-                    return True
+            prev_pct = history[-2].get("battery_pct")
+            curr_pct = history[-1].get("battery_pct")
+            if prev_pct is not None and curr_pct is not None and curr_pct > prev_pct:
+                return True
 
         return False
 
@@ -344,8 +473,9 @@ class SmartChargeCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         """Force an immediate update of the coordinator data."""
         await self.async_request_refresh()
 
-    def get_device_info(self) -> dict[str, Any]:
-        """Get device information for entity registration."""
+    @cached_property
+    def device_info(self) -> dict[str, Any]:
+        """Device information for entity registration (built once)."""
         return {
             "identifiers": {(DOMAIN, self.device_id)},
             "name": self.config.get("name", f"SmartCharge Device {self.device_id}"),
@@ -354,6 +484,10 @@ class SmartChargeCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             "sw_version": INTEGRATION_VERSION,
         }
 
+    def get_device_info(self) -> dict[str, Any]:
+        """Get device information for entity registration."""
+        return self.device_info
+
     def async_shutdown(self) -> None:
         """Clean up coordinator resources."""
         self._cleanup_state_listener()
@@ -2,14 +2,21 @@
 
 from __future__ import annotations
 
+import asyncio
 import csv
+import hashlib
 import logging
-from collections.abc import Callable
+import time
+from bisect import bisect_left, bisect_right
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterable, Sequence
 from datetime import datetime
+from heapq import merge
+from operator import itemgetter
 from pathlib import Path
 from typing import Any, Optional
 
-from homeassistant.core import HomeAssistant, Event
+from homeassistant.core import HomeAssistant, Event, callback
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.util import dt as dt_util
 from homeassistant.helpers.storage import Store
@@ -17,8 +24,65 @@ from homeassistant.helpers.event import async_call_later
 
 _LOGGER = logging.getLogger(__name__)
 
-STORAGE_VERSION = 1
+# Samples are kept in chronological order of their epoch "ts".
+_SAMPLE_TS = itemgetter("ts")
+
+# Shared read-only history for devices without samples.
+_EMPTY_HISTORY: tuple[dict[str, Any], ...] = ()
+
+# Stored precision: millisecond timestamps and rates to 1e-4 %/min keep the
+# JSON payload short without affecting predictions.
+_TS_DIGITS = 3
+_RATE_DIGITS = 4
+
+# CSV export columns, covering every field record_sample can store.
+CSV_FIELDS = (
+    "timestamp",
+    "battery_pct",
+    "temperature",
+    "humidity",
+    "rate_pct_per_min",
+    "charger_power_w",
+    "optimized_charging",
+    "battery_health",
+)
+
+# Version 1 kept every device's samples in one file; version 2 stores an index
+# mapping device ids to the keys of the stores holding their samples.
+STORAGE_VERSION = 2
 STORAGE_KEY = "smartcharge_predictor_history"
+# Seconds from the first unsaved change to the debounced save.
+SAVE_DELAY = 300.0
+
+
+def _format_ts(ts: float) -> str:
+    """Format epoch seconds as an ISO 8601 UTC timestamp."""
+    return dt_util.utc_from_timestamp(ts).isoformat()
+
+
+class _HistoryIndexStore(Store[dict[str, Any]]):
+    """Index store that migrates the single-file layout to device stores."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        split_history: Callable[
+            [dict[str, list[dict[str, Any]]]], Awaitable[dict[str, Any]]
+        ],
+    ) -> None:
+        """Initialize the index store."""
+        super().__init__(
+            hass, STORAGE_VERSION, STORAGE_KEY, serialize_in_event_loop=False
+        )
+        self._split_history = split_history
+
+    async def _async_migrate_func(
+        self, old_major_version: int, old_minor_version: int, old_data: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Migrate stored history to the current layout."""
+        if old_major_version == 1:
+            return await self._split_history(old_data.get("history", {}))
+        raise NotImplementedError
 
 
 class HistoryManager:
@@ -27,80 +91,272 @@ class HistoryManager:
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize the history manager."""
         self.hass = hass
-        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
-        self._history: dict[str, list[dict[str, Any]]] = {}
+        self._store = _HistoryIndexStore(hass, self._async_split_history)
+        self._device_stores: dict[str, Store] = {}
+        # Per-device store key suffixes, as recorded in the index.
+        self._shard_keys: dict[str, str] = {}
+        # Per-device samples, bounded by the device's max history limit.
+        self._history: dict[str, deque[dict[str, Any]]] = {}
         self._save_timer: Optional[Callable[[], None]] = None
         # Per-device max history limits (default applied if not set).
         self._max_history_limits: dict[str, int] = {}
+        # Devices changed since their store was last written.
+        self._dirty: set[str] = set()
+        # Device ids in the stored index; None until it loads successfully,
+        # so a failed load never overwrites the stored history.
+        self._saved_index: set[str] | None = None
+        # Devices whose store failed to load; kept in the index so their
+        # stored samples are retried on the next start rather than dropped.
+        self._unreadable: set[str] = set()
+        # Per-device statistics, dropped whenever the device's history changes.
+        self._stats_cache: dict[str, dict[str, Any]] = {}
+        # Per-device change counters for callers caching derived values.
+        self._versions: dict[str, int] = {}
 
         # Register shutdown listener for immediate save.
-        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self._async_shutdown_save)
+        self._unsub_stop: Callable[[], None] | None = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STOP, self._async_shutdown_save
+        )
 
     def set_max_history_samples(self, device_id: str, max_samples: int) -> None:
         """Set maximum history samples for a device."""
         self._max_history_limits[device_id] = max_samples
+        history = self._history.get(device_id)
+        if history is not None and history.maxlen != max_samples:
+            self._history[device_id] = deque(history, maxlen=max_samples)
+            # Loaded history has no limit yet; only trimming changes the store.
+            if len(history) > max_samples:
+                self._mark_changed(device_id)
+
+    def _mark_changed(self, device_id: str) -> None:
+        """Flag a device's history as unsaved and its statistics as stale."""
+        self._dirty.add(device_id)
+        self._stats_cache.pop(device_id, None)
+        self._versions[device_id] = self._versions.get(device_id, 0) + 1
+
+    def get_history_version(self, device_id: str) -> int:
+        """Get a counter that changes whenever a device's history changes."""
+        return self._versions.get(device_id, 0)
 
     def get_max_history_samples(self, device_id: str, default: int) -> int:
         """Get maximum history samples for a device."""
         return self._max_history_limits.get(device_id, default)
 
+    def _device_history(
+        self, device_id: str, max_samples: int | None = None
+    ) -> deque[dict[str, Any]]:
+        """Get (or create) the bounded sample buffer for a device."""
+        if max_samples is None:
+            max_samples = self._max_history_limits.get(device_id)
+        history = self._history.get(device_id)
+        if history is None:
+            history = self._history[device_id] = deque(maxlen=max_samples)
+        elif history.maxlen != max_samples:
+            history = self._history[device_id] = deque(history, maxlen=max_samples)
+        return history
+
+    def _create_store(self, key: str) -> Store:
+        """Create a store that serializes off the event loop."""
+        # Saves hand Store snapshot lists, so encoding in the executor is safe.
+        return Store(self.hass, STORAGE_VERSION, key, serialize_in_event_loop=False)
+
+    def _shard_key(self, device_id: str) -> str:
+        """Get (or assign) the store key suffix for a device."""
+        key = self._shard_keys.get(device_id)
+        if key is None:
+            # Device ids differ only in case or punctuation, so a slug could
+            # collide; a digest of the full id cannot in practice.
+            key = self._shard_keys[device_id] = hashlib.sha256(
+                device_id.encode()
+            ).hexdigest()[:32]
+        return key
+
+    def _device_store(self, device_id: str) -> Store:
+        """Get (or create) the store holding one device's samples."""
+        store = self._device_stores.get(device_id)
+        if store is None:
+            store = self._device_stores[device_id] = self._create_store(
+                f"{STORAGE_KEY}.{self._shard_key(device_id)}"
+            )
+        return store
+
+    def _index_data(self, device_ids: Iterable[str]) -> dict[str, Any]:
+        """Build the stored index for the given devices."""
+        return {
+            "devices": {
+                device_id: self._shard_key(device_id)
+                for device_id in sorted(device_ids)
+            }
+        }
+
     async def async_load(self) -> None:
         """Load history data from storage."""
+        self._dirty.clear()
+        self._stats_cache.clear()
+        self._unreadable.clear()
+        history: dict[str, list[dict[str, Any]]] = {}
         try:
-            data = await self._store.async_load()
-            if data:
-                self._history = data.get("history", {})
-                _LOGGER.debug("Loaded history for %d devices", len(self._history))
+            # Older layouts are migrated by the index store before this returns.
+            data = await self._store.async_load() or {}
+            self._shard_keys = dict(data.get("devices", {}))
+            device_ids = list(self._shard_keys)
+            shards = await asyncio.gather(
+                *(
+                    self._device_store(device_id).async_load()
+                    for device_id in device_ids
+                ),
+                return_exceptions=True,
+            )
+            for device_id, shard in zip(device_ids, shards):
+                if isinstance(shard, Exception):
+                    _LOGGER.error(
+                        "Failed to load history for device %s: %s", device_id, shard
+                    )
+                    self._unreadable.add(device_id)
+                elif shard:
+                    history[device_id] = shard.get("samples", [])
+            self._saved_index = set(device_ids)
+            _LOGGER.debug("Loaded history for %d devices", len(history))
         except Exception as err:
             _LOGGER.error("Failed to load history data: %s", err)
-            self._history = {}
+            history = {}
+            self._saved_index = None
+
+        self._history = {
+            device_id: deque(samples, maxlen=self._max_history_limits.get(device_id))
+            for device_id, samples in history.items()
+        }
+
+    async def _async_split_history(
+        self, history: dict[str, list[dict[str, Any]]]
+    ) -> dict[str, Any]:
+        """Write single-file history to per-device stores and return the index."""
+        await asyncio.gather(
+            *(
+                self._device_store(device_id).async_save(
+                    {"samples": self._migrate_timestamps(samples)}
+                )
+                for device_id, samples in history.items()
+            )
+        )
+        _LOGGER.info(
+            "Migrated history for %d device(s) to per-device storage", len(history)
+        )
+        return self._index_data(history)
+
+    @staticmethod
+    def _migrate_timestamps(
+        samples: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Convert version 1 ISO timestamps to epoch seconds, dropping bad samples."""
+        migrated: list[dict[str, Any]] = []
+        for sample in samples:
+            if "ts" not in sample:
+                ts_str = sample.pop("timestamp", None)
+                parsed = dt_util.parse_datetime(ts_str) if ts_str else None
+                if parsed is None:
+                    continue
+                sample["ts"] = parsed.timestamp()
+            migrated.append(sample)
+        # Older histories may hold backfilled samples out of order.
+        return sorted(migrated, key=_SAMPLE_TS)
 
     async def async_save(self, immediate: bool = False) -> None:
         """Save history data to storage with debouncing."""
+        if not immediate:
+            # Coalesce: an armed timer already covers this change, and not
+            # re-arming it caps how long unsaved samples can wait.
+            if self._save_timer is None:
+                self._save_timer = async_call_later(
+                    self.hass, SAVE_DELAY, self._async_save_callback
+                )
+            return
+
         # Cancel existing timer if any.
         if self._save_timer:
             self._save_timer()
             self._save_timer = None
 
-        if immediate:
-            # Save immediately (e.g., on shutdown).
-            await self._do_save()
-        else:
-            # Debounce: schedule save after 5 minutes of inactivity.
-            self._save_timer = async_call_later(
-                self.hass, 300.0, self._async_save_callback
-            )
+        # Save immediately (e.g., on shutdown).
+        await self._do_save()
 
     async def _async_save_callback(self, _now: datetime) -> None:
         """Callback for debounced save."""
         self._save_timer = None
         await self._do_save()
 
+    async def _async_save_device(self, device_id: str) -> None:
+        """Write (or remove) the store for one device."""
+        store = self._device_store(device_id)
+        samples = self._history.get(device_id)
+        if samples is None:
+            del self._device_stores[device_id]
+            del self._shard_keys[device_id]
+            await store.async_remove()
+            self._unreadable.discard(device_id)
+        else:
+            await store.async_save({"samples": list(samples)})
+
     async def _do_save(self) -> None:
         """Perform the actual save operation."""
+        if self._saved_index is None:
+            _LOGGER.warning("History was not loaded, skipping write")
+            return
+
+        device_ids = self._history.keys() | self._unreadable
+        dirty = self._dirty
+        index_changed = device_ids != self._saved_index
+        if not dirty and not index_changed:
+            _LOGGER.debug("History unchanged since last save, skipping write")
+            return
+
+        # Changes made while the writes are in flight are picked up next time.
+        self._dirty = set()
+        pending = list(dirty)
+        results = await asyncio.gather(
+            *(self._async_save_device(device_id) for device_id in pending),
+            return_exceptions=True,
+        )
+        failed = {
+            device_id
+            for device_id, result in zip(pending, results)
+            if isinstance(result, Exception)
+        }
+
         try:
-            await self._store.async_save({"history": self._history})
-            device_count = len(self._history)
-            if device_count > 0:
-                total_samples = sum(len(samples) for samples in self._history.values())
-                device_ids = list(self._history.keys())
-                _LOGGER.debug(
-                    "Saved history for %d device(s) (%d total samples): %s",
-                    device_count,
-                    total_samples,
-                    ", ".join(device_ids),
-                )
-            else:
-                _LOGGER.debug("Saved history (no devices)")
+            if index_changed:
+                await self._store.async_save(self._index_data(device_ids))
+                self._saved_index = device_ids
         except Exception as err:
-            _LOGGER.error("Failed to save history data: %s", err)
+            _LOGGER.error("Failed to save history index: %s", err)
+
+        if failed:
+            self._dirty |= failed
+            _LOGGER.error(
+                "Failed to save history for device(s): %s", ", ".join(sorted(failed))
+            )
+        else:
+            _LOGGER.debug(
+                "Saved history for %d device(s): %s",
+                len(pending),
+                ", ".join(pending),
+            )
 
     async def _async_shutdown_save(self, _event: Event) -> None:
         """Save history immediately on shutdown."""
+        self._unsub_stop = None
+        # Only dirty devices are written; unchanged stores are left as they are.
+        await self.async_save(immediate=True)
+
+    @callback
+    def async_unload(self) -> None:
+        """Cancel the pending save and the shutdown listener."""
         if self._save_timer:
             self._save_timer()
             self._save_timer = None
-        await self._do_save()
+        if self._unsub_stop:
+            self._unsub_stop()
+            self._unsub_stop = None
 
     def record_sample(
         self,
@@ -109,42 +365,38 @@ class HistoryManager:
         temperature: Optional[float] = None,
         humidity: Optional[float] = None,
         rate_pct_per_min: Optional[float] = None,
-        charger_power_w: Optional[float] = None,
-        optimized_charging: Optional[bool] = None,
-        battery_health: Optional[float] = None,
+        charger_power_w: float | None = None,
+        optimized_charging: bool | None = None,
+        battery_health: float | None = None,
         max_history_samples: Optional[int] = None,
     ) -> None:
         """Record a charging sample for a device."""
-        if device_id not in self._history:
-            self._history[device_id] = []
+        # Use the provided limit or the stored one; without either the history
+        # is unbounded until the device is configured.
+        history = self._device_history(device_id, max_history_samples)
 
-        sample = {
-            "timestamp": dt_util.utcnow().isoformat(),
+        sample: dict[str, Any] = {
+            "ts": round(time.time(), _TS_DIGITS),
             "battery_pct": battery_pct,
-            "temperature": temperature,
-            "humidity": humidity,
-            "rate_pct_per_min": rate_pct_per_min,
-            "charger_power_w": charger_power_w,
-            "optimized_charging": optimized_charging,
-            "battery_health": battery_health,
         }
 
-        # Remove None values to keep data clean.
-        sample = {k: v for k, v in sample.items() if v is not None}
-
-        self._history[device_id].append(sample)
-
-        # Get max history limit for this device (use provided value or stored limit).
-        if max_history_samples is None:
-            # Use stored limit if available, otherwise keep all (will be set when device is configured).
-            max_history_samples = self._max_history_limits.get(device_id)
-
-        # Keep only last N samples per device to prevent unlimited growth.
-        if (
-            max_history_samples is not None
-            and len(self._history[device_id]) > max_history_samples
-        ):
-            self._history[device_id] = self._history[device_id][-max_history_samples:]
+        # Only store fields that have a value to keep data clean.
+        if temperature is not None:
+            sample["temperature"] = temperature
+        if humidity is not None:
+            sample["humidity"] = humidity
+        if rate_pct_per_min is not None:
+            sample["rate_pct_per_min"] = round(rate_pct_per_min, _RATE_DIGITS)
+        if charger_power_w is not None:
+            sample["charger_power_w"] = charger_power_w
+        if optimized_charging is not None:
+            sample["optimized_charging"] = optimized_charging
+        if battery_health is not None:
+            sample["battery_health"] = battery_health
+
+        # The deque drops the oldest sample once the limit is reached.
+        history.append(sample)
+        self._mark_changed(device_id)
 
         _LOGGER.debug(
             "Recorded sample for device %s: battery=%s%%, rate=%s%%/min",
@@ -153,32 +405,89 @@ class HistoryManager:
             rate_pct_per_min,
         )
 
-    def get_history(self, device_id: str) -> list[dict[str, Any]]:
-        """Get charging history for a device."""
-        return self._history.get(device_id, [])
+    def record_samples(
+        self,
+        device_id: str,
+        samples: Iterable[
+            tuple[datetime, float, float | None, float | None, float | None]
+        ],
+        *,
+        charger_power_w: float | None = None,
+        optimized_charging: bool | None = None,
+        battery_health: float | None = None,
+    ) -> int:
+        """Record a batch of (timestamp, battery, temp, humidity, rate) samples."""
+        new_samples: list[dict[str, Any]] = []
+
+        # Values shared by every sample in the batch (None values dropped once).
+        shared = {
+            k: v
+            for k, v in (
+                ("charger_power_w", charger_power_w),
+                ("optimized_charging", optimized_charging),
+                ("battery_health", battery_health),
+            )
+            if v is not None
+        }
+
+        append = new_samples.append
+        for timestamp, battery_pct, temperature, humidity, rate in samples:
+            sample: dict[str, Any] = {
+                "ts": round(timestamp.timestamp(), _TS_DIGITS),
+                "battery_pct": battery_pct,
+            }
+            if temperature is not None:
+                sample["temperature"] = temperature
+            if humidity is not None:
+                sample["humidity"] = humidity
+            if rate is not None:
+                sample["rate_pct_per_min"] = round(rate, _RATE_DIGITS)
+            sample.update(shared)
+            append(sample)
+
+        count = len(new_samples)
+        if not count:
+            return 0
+
+        history = self._device_history(device_id)
+        if history and new_samples[0]["ts"] < history[-1]["ts"]:
+            # Backfilled samples: merge so the history stays time-ordered.
+            self._history[device_id] = deque(
+                merge(history, new_samples, key=_SAMPLE_TS), maxlen=history.maxlen
+            )
+        else:
+            history.extend(new_samples)
+        self._mark_changed(device_id)
+
+        _LOGGER.debug("Recorded %d samples for device %s", count, device_id)
+        return count
+
+    def get_history(self, device_id: str) -> Sequence[dict[str, Any]]:
+        """Get a live, read-only view of a device's history, oldest first."""
+        # Only read it on the event loop without awaiting in between; callers
+        # that await or hand samples to the executor must copy it first.
+        return self._history.get(device_id, _EMPTY_HISTORY)
 
     def clear_history(self, device_id: str) -> None:
         """Clear charging history for a device."""
         if device_id in self._history:
             del self._history[device_id]
+            self._mark_changed(device_id)
             _LOGGER.info("Cleared history for device %s", device_id)
 
     def cleanup_orphaned_devices(self, active_device_ids: set[str]) -> list[str]:
         """Remove history for devices that no longer exist."""
-        orphaned_device_ids = []
-        for device_id in list(self._history.keys()):
-            if device_id not in active_device_ids:
-                orphaned_device_ids.append(device_id)
-                sample_count = len(self._history[device_id])
-                del self._history[device_id]
-                # Also remove max history limit for orphaned device.
-                if device_id in self._max_history_limits:
-                    del self._max_history_limits[device_id]
-                _LOGGER.info(
-                    "Cleaned up orphaned history for device %s (%d samples removed)",
-                    device_id,
-                    sample_count,
-                )
+        orphaned_device_ids = sorted(self._history.keys() - active_device_ids)
+        for device_id in orphaned_device_ids:
+            sample_count = len(self._history.pop(device_id))
+            # Also remove max history limit for orphaned device.
+            self._max_history_limits.pop(device_id, None)
+            self._mark_changed(device_id)
+            _LOGGER.info(
+                "Cleaned up orphaned history for device %s (%d samples removed)",
+                device_id,
+                sample_count,
+            )
 
         if orphaned_device_ids:
             _LOGGER.info(
@@ -196,21 +505,17 @@ class HistoryManager:
         if device_id not in self._history:
             return
 
-        # Filter out samples within the specified time range.
-        # Keep samples that are before the start_time or after the end_time.
-        filtered_samples = []
-        for sample in self._history[device_id]:
-            ts_str = sample.get("timestamp")
-            if not ts_str:
-                continue
-            ts = dt_util.parse_datetime(ts_str)
-            if ts is None:
-                continue
-            # Keep sample if it's outside the time range.
-            if ts < start_time or ts > end_time:
-                filtered_samples.append(sample)
-
-        self._history[device_id] = filtered_samples
+        # Samples are time-ordered, so the period is one contiguous run.
+        history = self._history[device_id]
+        lo = bisect_left(history, start_time.timestamp(), key=_SAMPLE_TS)
+        hi = bisect_right(history, end_time.timestamp(), lo=lo, key=_SAMPLE_TS)
+        if hi > lo:
+            # Rotate the run to the left end, drop it, then rotate back.
+            history.rotate(-lo)
+            for _ in range(hi - lo):
+                history.popleft()
+            history.rotate(lo)
+            self._mark_changed(device_id)
         _LOGGER.info(
             "Cleared history for device %s from %s to %s",
             device_id,
@@ -220,87 +525,74 @@ class HistoryManager:
 
     def get_sample_count(self, device_id: str) -> int:
         """Get the number of samples for a device."""
-        return len(self._history.get(device_id, []))
+        return len(self._history.get(device_id, _EMPTY_HISTORY))
 
     def get_latest_sample(self, device_id: str) -> Optional[dict[str, Any]]:
         """Get the most recent sample for a device."""
-        history = self._history.get(device_id, [])
+        history = self._history.get(device_id)
         return history[-1] if history else None
 
+    def get_latest_sample_epoch(self, device_id: str) -> float | None:
+        """Get the most recent sample time for a device as epoch seconds."""
+        latest_sample = self.get_latest_sample(device_id)
+        return latest_sample["ts"] if latest_sample else None
+
     def calculate_rate_from_samples(
         self, device_id: str, current_battery_pct: float
     ) -> Optional[float]:
         """Calculate charging rate from recent samples."""
-        history = self._history.get(device_id, [])
+        history = self._history.get(device_id, _EMPTY_HISTORY)
         if len(history) < 2:
             return None
 
-        # Get the most recent sample.
-        latest_sample = history[-1]
-        latest_battery = latest_sample.get("battery_pct")
-        latest_timestamp = latest_sample.get("timestamp")
+        # Every sample carries "ts" and "battery_pct".
+        latest = history[-1]
+        time_diff_seconds = time.time() - latest["ts"]
 
-        if latest_battery is None or latest_timestamp is None:
+        # Ignore old or invalid data (>300 seconds = 5 minutes).
+        if not 0 < time_diff_seconds <= 300:
             return None
 
-        # Calculate time difference.
-        try:
-            latest_time = dt_util.parse_datetime(latest_timestamp)
-            if latest_time is None:
-                return None
-            current_time = dt_util.utcnow()
-            time_diff_seconds = (current_time - latest_time).total_seconds()
-
-            if (
-                time_diff_seconds <= 0 or time_diff_seconds > 300
-            ):  # Ignore old or invalid data (>300 seconds = 5 minutes).
-                return None
-
-            time_diff_minutes = time_diff_seconds / 60.0
-
-            # Calculate rate.
-            battery_diff = current_battery_pct - latest_battery
-            if battery_diff <= 0:  # Not charging.
-                return None
-
-            rate = battery_diff / time_diff_minutes
-            return max(0.0, rate)  # Ensure positive rate.
-
-        except (ValueError, TypeError) as err:
-            _LOGGER.warning("Failed to calculate rate from samples: %s", err)
+        # Calculate rate; only positive changes count as charging.
+        battery_diff = current_battery_pct - latest["battery_pct"]
+        if battery_diff <= 0:
             return None
 
+        return battery_diff * 60.0 / time_diff_seconds
+
     async def export_csv(self, device_id: str) -> Optional[str]:
         """Export device history to CSV file."""
-        history = self._history.get(device_id, [])
+        history = self._history.get(device_id)
         if not history:
             _LOGGER.warning("No history data to export for device %s", device_id)
             return None
 
-        # Create exports directory.
+        # Snapshot the samples so the loop can keep recording while we write.
+        samples = list(history)
         exports_dir = Path(self.hass.config.path("smartcharge_predictor_exports"))
-        exports_dir.mkdir(exist_ok=True)
 
         # Generate filename with timestamp.
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         filename = f"{device_id}_history_{timestamp}.csv"
         filepath = exports_dir / filename
 
-        try:
+        # Write the file in executor to avoid blocking event loop.
+        def _write_csv() -> None:
+            exports_dir.mkdir(exist_ok=True)
             with open(filepath, "w", newline="", encoding="utf-8") as csvfile:
-                if not history:
-                    return None
-
-                # Get all possible fieldnames from all samples.
-                fieldnames = set()
-                for sample in history:
-                    fieldnames.update(sample.keys())
-                fieldnames = sorted(list(fieldnames))
-
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+                # Timestamps are stored as epoch seconds; export them as ISO.
+                # The raw "ts" key is not a CSV column and is ignored.
+                writer = csv.DictWriter(
+                    csvfile, fieldnames=CSV_FIELDS, extrasaction="ignore"
+                )
                 writer.writeheader()
-                writer.writerows(history)
+                writer.writerows(
+                    {**sample, "timestamp": _format_ts(sample["ts"])}
+                    for sample in samples
+                )
 
+        try:
+            await self.hass.async_add_executor_job(_write_csv)
             _LOGGER.info("Exported history for device %s to %s", device_id, filepath)
             return str(filepath)
 
@@ -314,40 +606,62 @@ class HistoryManager:
 
     def get_statistics(self, device_id: str) -> dict[str, Any]:
         """Get charging statistics for a device."""
-        history = self._history.get(device_id, [])
+        history = self._history.get(device_id)
         if not history:
             return {}
 
-        # Calculate basic statistics.
-        rates = [
-            s.get("rate_pct_per_min")
-            for s in history
-            if s.get("rate_pct_per_min") is not None
-        ]
-        temperatures = [
-            s.get("temperature") for s in history if s.get("temperature") is not None
-        ]
-
-        stats = {
+        cached = self._stats_cache.get(device_id)
+        if cached is not None:
+            return cached
+
+        # Calculate basic statistics in a single pass.
+        rate_acc = _Accumulator()
+        temp_acc = _Accumulator()
+        for sample in history:
+            rate = sample.get("rate_pct_per_min")
+            if rate is not None:
+                rate_acc.add(rate)
+            temperature = sample.get("temperature")
+            if temperature is not None:
+                temp_acc.add(temperature)
+
+        stats: dict[str, Any] = {
             "total_samples": len(history),
             "date_range": {
-                "first": history[0].get("timestamp") if history else None,
-                "last": history[-1].get("timestamp") if history else None,
+                "first": _format_ts(history[0]["ts"]),
+                "last": _format_ts(history[-1]["ts"]),
             },
         }
 
-        if rates:
-            stats["rate_stats"] = {
-                "min": min(rates),
-                "max": max(rates),
-                "avg": sum(rates) / len(rates),
-            }
+        if rate_acc.count:
+            stats["rate_stats"] = rate_acc.as_dict()
 
-        if temperatures:
-            stats["temperature_stats"] = {
-                "min": min(temperatures),
-                "max": max(temperatures),
-                "avg": sum(temperatures) / len(temperatures),
-            }
+        if temp_acc.count:
+            stats["temperature_stats"] = temp_acc.as_dict()
 
+        self._stats_cache[device_id] = stats
         return stats
+
+
+class _Accumulator:
+    """Running count, sum, min and max of a numeric field."""
+
+    __slots__ = ("count", "max", "min", "total")
+
+    def __init__(self) -> None:
+        """Initialize an empty accumulator."""
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def add(self, value: float) -> None:
+        """Add a value."""
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def as_dict(self) -> dict[str, float]:
+        """Return min, max and average."""
+        return {"min": self.min, "max": self.max, "avg": self.total / self.count}
@@ -4,7 +4,10 @@ from __future__ import annotations
 
 import logging
 import pickle
+import time
+from collections.abc import Iterable, Sequence
 from datetime import datetime, timedelta
+from itertools import takewhile
 from pathlib import Path
 from typing import Any, Optional
 
@@ -26,6 +29,10 @@ from .const import (
     ML_MODEL_TYPE,
     MIN_SAMPLES_FOR_TRAINING,
     MODEL_FILE_SUFFIX,
+    RETRAIN_INTERVAL_SECONDS,
+    RETRAIN_MAX_SKIPPED_INTERVALS,
+    RETRAIN_MIN_DRIFT,
+    RETRAIN_MIN_NEW_FRACTION,
     STORAGE_DIR,
     TEMP_HIGH_THRESHOLD,
     TEMP_REDUCTION_MIN,
@@ -38,6 +45,25 @@ _LOGGER = logging.getLogger(__name__)
 # Lazy ML import to avoid blocking the event loop at import time.
 SKLEARN_AVAILABLE = False
 
+# Unpickled model data per device, with the file mtime it was read at.
+_MODEL_CACHE: dict[str, tuple[float, dict[str, Any]]] = {}
+
+# Training features in column order, with the value used when one is missing.
+_FEATURE_KEYS = (
+    "battery_pct",
+    "temperature",
+    "humidity",
+    "charger_power_w",
+    "battery_health",
+    "optimized_charging",
+)
+_FEATURE_DEFAULTS = (0.0, 20.0, 50.0, 20.0, 100.0, 0.0)
+
+
+def evict_cached_model(device_id: str) -> None:
+    """Drop a device's unpickled model data from the reload cache."""
+    _MODEL_CACHE.pop(device_id, None)
+
 
 def _import_ml_libs() -> dict[str, Any]:
     """Import heavy ML libraries in a background thread and return refs."""
@@ -62,6 +88,96 @@ def _import_ml_libs() -> dict[str, Any]:
         raise exc
 
 
+def _empirical_rate(
+    battery_pct: float,
+    temperature: float | None,
+    charger_power_w: float | None,
+    battery_health: float | None,
+    optimized_charging: bool | None,
+) -> float:
+    """Empirical charging rate for one set of conditions (humidity is unused)."""
+    # Base rate based on battery level.
+    if battery_pct < FAST_CHARGE_THRESHOLD:
+        base_rate = DEFAULT_FAST_RATE
+    else:
+        base_rate = DEFAULT_SLOW_RATE
+
+    # Apply correction factors.
+    correction_factor = 1.0
+
+    # Temperature correction (variable 10-15% reduction).
+    if temperature is not None and temperature > TEMP_HIGH_THRESHOLD:
+        # Calculate variable reduction: 10% + (temperature - 30) * 0.05 / 10.
+        # Caps between TEMP_REDUCTION_MIN and TEMP_REDUCTION_MAX.
+        temp_excess = temperature - TEMP_HIGH_THRESHOLD
+        reduction = min(
+            TEMP_REDUCTION_MAX,
+            max(
+                TEMP_REDUCTION_MIN,
+                TEMP_REDUCTION_MIN + (temp_excess * 0.05 / 10.0),
+            ),
+        )
+        correction_factor *= 1.0 - reduction
+
+    # Battery health correction.
+    if battery_health is not None and battery_health < HEALTH_LOW_THRESHOLD:
+        correction_factor *= HEALTH_REDUCTION_FACTOR
+
+    # Optimized charging correction (clamp rate after 80%).
+    if optimized_charging and battery_pct >= FAST_CHARGE_THRESHOLD:
+        correction_factor *= 0.5  # Significantly reduce rate.
+
+    # Charger power correction (normalize to 20W baseline).
+    if charger_power_w is not None:
+        power_factor = min(charger_power_w / 20.0, 2.0)  # Cap at 2x.
+        correction_factor *= power_factor
+
+    predicted_rate = base_rate * correction_factor
+    return max(0.01, predicted_rate)  # Minimum rate to prevent zero.
+
+
+def _empirical_rates(np: Any, X: Any) -> Any:
+    """Vectorized _empirical_rate over rows of training features."""
+    # Columns from _prepare_training_data: battery, temperature, humidity,
+    # power, health, optimized flag (defaults already filled in).
+    battery = X[:, 0]
+    temperature = X[:, 1]
+    fast = battery < FAST_CHARGE_THRESHOLD
+    base_rate = np.where(fast, DEFAULT_FAST_RATE, DEFAULT_SLOW_RATE)
+
+    reduction = np.clip(
+        TEMP_REDUCTION_MIN + (temperature - TEMP_HIGH_THRESHOLD) * 0.05 / 10.0,
+        TEMP_REDUCTION_MIN,
+        TEMP_REDUCTION_MAX,
+    )
+    correction = np.where(temperature > TEMP_HIGH_THRESHOLD, 1.0 - reduction, 1.0)
+    correction *= np.where(X[:, 4] < HEALTH_LOW_THRESHOLD, HEALTH_REDUCTION_FACTOR, 1.0)
+    correction *= np.where((X[:, 5] != 0) & ~fast, 0.5, 1.0)
+    correction *= np.minimum(X[:, 3] / 20.0, 2.0)
+
+    return np.maximum(0.01, base_rate * correction)
+
+
+def _linear_params(model: Any) -> tuple[Any, tuple[float, ...] | None, float]:
+    """Extract plain-float coefficients from a fitted linear model."""
+    coef = getattr(model, "coef_", None)
+    if coef is None or getattr(coef, "ndim", 1) != 1 or len(coef) != 6:
+        return (model, None, 0.0)
+    return (model, tuple(float(c) for c in coef), float(model.intercept_))
+
+
+def _rate_summary(samples: Iterable[dict[str, Any]]) -> tuple[int, float]:
+    """Return the number of samples with a charge rate and their mean rate."""
+    count = 0
+    total = 0.0
+    for sample in samples:
+        rate = sample.get("rate_pct_per_min")
+        if rate is not None:
+            count += 1
+            total += rate
+    return count, total / count if count else 0.0
+
+
 class ChargingModel:
     """Charging prediction model with empirical and ML capabilities."""
 
@@ -75,10 +191,25 @@ class ChargingModel:
         self.model_type = EMPIRICAL_MODEL_TYPE
         self.ml_model = None
         self.last_training = None
+        # Model info that only changes when the model does.
+        self._model_info_cache: dict[str, Any] | None = None
+        # Monotonic time at which the model becomes due for retraining.
+        self._retrain_due: float | None = None
+        # Epoch seconds of the last training; later samples count as new.
+        self._trained_ts: float | None = None
+        # (sample count, mean charge rate) the current model was trained on.
+        self._trained_rates: tuple[int, float] | None = None
+        # Retrains skipped in a row because charging had not changed.
+        self._skipped_retrains = 0
         self.model_accuracy = None
         self.empirical_accuracy = None
         self.selected_model_type = EMPIRICAL_MODEL_TYPE
         self._ml_refs: Optional[dict[str, Any]] = None
+        # Reusable feature row for single-sample ML predictions.
+        self._feature_buf: Any = None
+        # (model, coefficients, intercept); coefficients are None for
+        # models that are not linear.
+        self._linear_params: tuple[Any, tuple[float, ...] | None, float] | None = None
 
         # Model storage path.
         self.storage_path = Path(hass.config.path(STORAGE_DIR))
@@ -107,22 +238,33 @@ class ChargingModel:
         if not await self._async_ensure_ml():
             return
 
-        try:
-            if self.model_file.exists():
-                # Load model file in executor to avoid blocking event loop.
-                def _load_model():
-                    with open(self.model_file, "rb") as f:
-                        return pickle.load(f)
+        # Load model file in executor to avoid blocking event loop; options
+        # reloads of an unchanged file reuse the already unpickled model.
+        def _load_model():
+            try:
+                mtime = self.model_file.stat().st_mtime
+            except FileNotFoundError:
+                return None
+            cached = _MODEL_CACHE.get(self.device_id)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+            with open(self.model_file, "rb") as f:
+                model_data = pickle.load(f)
+            _MODEL_CACHE[self.device_id] = (mtime, model_data)
+            return model_data
 
-                model_data = await self.hass.async_add_executor_job(_load_model)
+        try:
+            model_data = await self.hass.async_add_executor_job(_load_model)
+            if model_data is not None:
                 self.ml_model = model_data.get("model")
-                self.last_training = model_data.get("last_training")
+                self._set_last_training(model_data.get("last_training"))
                 self.model_accuracy = model_data.get("accuracy")
                 self.empirical_accuracy = model_data.get("empirical_accuracy")
                 self.selected_model_type = model_data.get(
                     "selected_model_type", ML_MODEL_TYPE
                 )
                 self.model_type = self.selected_model_type
+                self._model_info_cache = None
                 _LOGGER.info(
                     "Loaded ML model for device %s (accuracy: %.3f)",
                     self.device_id,
@@ -134,6 +276,7 @@ class ChargingModel:
             )
             self.ml_model = None
             self.model_type = EMPIRICAL_MODEL_TYPE
+            self._model_info_cache = None
 
     async def async_save_model(self) -> None:
         """Save trained model to storage."""
@@ -148,8 +291,18 @@ class ChargingModel:
                 "empirical_accuracy": self.empirical_accuracy,
                 "selected_model_type": self.selected_model_type,
             }
-            with open(self.model_file, "wb") as f:
-                pickle.dump(model_data, f)
+
+            # Save model file in executor to avoid blocking event loop.
+            # Protocol 5 stores the estimators' NumPy arrays as raw buffers.
+            def _save_model():
+                with open(self.model_file, "wb") as f:
+                    pickle.dump(model_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+                _MODEL_CACHE[self.device_id] = (
+                    self.model_file.stat().st_mtime,
+                    model_data,
+                )
+
+            await self.hass.async_add_executor_job(_save_model)
             _LOGGER.info("Saved ML model for device %s", self.device_id)
         except Exception as err:
             _LOGGER.error(
@@ -196,44 +349,13 @@ class ChargingModel:
         optimized_charging: Optional[bool] = None,
     ) -> float:
         """Predict charging rate using empirical model."""
-        # Base rate based on battery level.
-        if battery_pct < FAST_CHARGE_THRESHOLD:
-            base_rate = DEFAULT_FAST_RATE
-        else:
-            base_rate = DEFAULT_SLOW_RATE
-
-        # Apply correction factors.
-        correction_factor = 1.0
-
-        # Temperature correction (variable 10-15% reduction).
-        if temperature is not None and temperature > TEMP_HIGH_THRESHOLD:
-            # Calculate variable reduction: 10% + (temperature - 30) * 0.05 / 10.
-            # Caps between TEMP_REDUCTION_MIN and TEMP_REDUCTION_MAX.
-            temp_excess = temperature - TEMP_HIGH_THRESHOLD
-            reduction = min(
-                TEMP_REDUCTION_MAX,
-                max(
-                    TEMP_REDUCTION_MIN,
-                    TEMP_REDUCTION_MIN + (temp_excess * 0.05 / 10.0),
-                ),
-            )
-            correction_factor *= 1.0 - reduction
-
-        # Battery health correction.
-        if battery_health is not None and battery_health < HEALTH_LOW_THRESHOLD:
-            correction_factor *= HEALTH_REDUCTION_FACTOR
-
-        # Optimized charging correction (clamp rate after 80%).
-        if optimized_charging and battery_pct >= FAST_CHARGE_THRESHOLD:
-            correction_factor *= 0.5  # Significantly reduce rate.
-
-        # Charger power correction (normalize to 20W baseline).
-        if charger_power_w is not None:
-            power_factor = min(charger_power_w / 20.0, 2.0)  # Cap at 2x.
-            correction_factor *= power_factor
-
-        predicted_rate = base_rate * correction_factor
-        return max(0.01, predicted_rate)  # Minimum rate to prevent zero.
+        return _empirical_rate(
+            battery_pct,
+            temperature,
+            charger_power_w,
+            battery_health,
+            optimized_charging,
+        )
 
     def _predict_with_ml(
         self,
@@ -256,18 +378,39 @@ class ChargingModel:
             )
 
         try:
-            # Prepare features for prediction.
-            features = [
-                battery_pct,
-                temperature or 20.0,  # Default temperature.
-                humidity or 50.0,  # Default humidity.
-                charger_power_w or 20.0,  # Default power.
-                battery_health or 100.0,  # Default health.
-                1.0 if optimized_charging else 0.0,  # Binary flag.
-            ]
+            # Linear models are evaluated directly from their coefficients,
+            # skipping sklearn's input validation on every update.
+            linear = self._linear_params
+            if linear is None or linear[0] is not self.ml_model:
+                linear = self._linear_params = _linear_params(self.ml_model)
+            coef = linear[1]
+            if coef is not None:
+                predicted_rate = (
+                    coef[0] * battery_pct
+                    + coef[1] * (temperature or 20.0)
+                    + coef[2] * (humidity or 50.0)
+                    + coef[3] * (charger_power_w or 20.0)
+                    + coef[4] * (battery_health or 100.0)
+                    + coef[5] * (1.0 if optimized_charging else 0.0)
+                    + linear[2]
+                )
+                return max(0.01, predicted_rate)
+
+            # Fill the reusable (1, 6) feature row in place.
+            features = self._feature_buf
+            if features is None:
+                np = self._ml_refs["np"]
+                features = self._feature_buf = np.empty((1, 6), dtype=np.float64)
+            row = features[0]
+            row[0] = battery_pct
+            row[1] = temperature or 20.0  # Default temperature.
+            row[2] = humidity or 50.0  # Default humidity.
+            row[3] = charger_power_w or 20.0  # Default power.
+            row[4] = battery_health or 100.0  # Default health.
+            row[5] = 1.0 if optimized_charging else 0.0  # Binary flag.
 
             # Predict rate.
-            predicted_rate = self.ml_model.predict([features])[0]
+            predicted_rate = float(self.ml_model.predict(features)[0])
             return max(0.01, predicted_rate)  # Ensure positive rate.
 
         except Exception as err:
@@ -284,28 +427,10 @@ class ChargingModel:
                 optimized_charging,
             )
 
-    def _evaluate_empirical_accuracy(
-        self, X_test: list[list[float]], y_test: list[float]
-    ) -> float:
+    def _evaluate_empirical_accuracy(self, X_test: Any, y_test: Any) -> float:
         """Evaluate empirical model accuracy on test data."""
-        y_pred_empirical = []
-        for features in X_test:
-            battery_pct = features[0]
-            temperature = features[1] if len(features) > 1 else None
-            humidity = features[2] if len(features) > 2 else None
-            charger_power_w = features[3] if len(features) > 3 else None
-            battery_health = features[4] if len(features) > 4 else None
-            optimized_charging = bool(features[5]) if len(features) > 5 else False
-
-            predicted_rate = self._predict_empirical(
-                battery_pct,
-                temperature,
-                humidity,
-                charger_power_w,
-                battery_health,
-                optimized_charging,
-            )
-            y_pred_empirical.append(predicted_rate)
+        np = self._ml_refs["np"]
+        y_pred_empirical = _empirical_rates(np, np.asarray(X_test, dtype=np.float64))
 
         r2 = self._ml_refs["r2_score"](y_test, y_pred_empirical)
         return r2
@@ -316,7 +441,8 @@ class ChargingModel:
             _LOGGER.debug("Scikit-learn not available - skipping ML training")
             return False
 
-        history = self.history_manager.get_history(self.device_id)
+        # Snapshot the live history so recording can continue while we train.
+        history = tuple(self.history_manager.get_history(self.device_id))
         if len(history) < MIN_SAMPLES_FOR_TRAINING:
             _LOGGER.info(
                 "Insufficient samples for training (%d < %d)",
@@ -343,9 +469,12 @@ class ChargingModel:
             lr_r2 = self._ml_refs["r2_score"](y_test, lr_pred)
             lr_mse = self._ml_refs["mean_squared_error"](y_test, lr_pred)
 
-            # Train RandomForest model.
+            # Train RandomForest model, sized to the amount of training data.
+            train_count = len(X_train)
             rf_model = self._ml_refs["RandomForestRegressor"](
-                n_estimators=100, random_state=42, max_depth=10
+                n_estimators=max(10, min(100, train_count // 5)),
+                random_state=42,
+                max_depth=min(10, max(3, train_count.bit_length() - 1)),
             )
             rf_model.fit(X_train, y_train)
             rf_pred = rf_model.predict(X_test)
@@ -377,7 +506,9 @@ class ChargingModel:
 
             self.model_accuracy = best_r2
             self.empirical_accuracy = empirical_r2
-            self.last_training = datetime.now().isoformat()
+            self._set_last_training(dt_util.utcnow().isoformat())
+            self._model_info_cache = None
+            self._trained_rates = _rate_summary(history)
 
             _LOGGER.info(
                 "Trained models for device %s: LinearRegression R²=%.3f, RandomForest R²=%.3f, Empirical R²=%.3f",
@@ -405,32 +536,28 @@ class ChargingModel:
             return False
 
     def _prepare_training_data(
-        self, history: list[dict[str, Any]]
-    ) -> tuple[list[list[float]], list[float]]:
-        """Prepare training data from history."""
-        X = []  # Features.
-        y = []  # Target (rate).
-
-        for sample in history:
-            # Skip samples without rate data.
-            rate = sample.get("rate_pct_per_min")
-            if rate is None or rate <= 0:
-                continue
-
-            # Extract features.
-            features = [
-                sample.get("battery_pct", 0.0),
-                sample.get("temperature", 20.0),
-                sample.get("humidity", 50.0),
-                sample.get("charger_power_w", 20.0),
-                sample.get("battery_health", 100.0),
-                1.0 if sample.get("optimized_charging") else 0.0,
-            ]
-
-            X.append(features)
-            y.append(rate)
-
-        return X, y
+        self, history: Sequence[dict[str, Any]]
+    ) -> tuple[Any, Any]:
+        """Prepare training data from history as (n, 6) features and n rates."""
+        np = self._ml_refs["np"]
+        count = len(history)
+
+        # Missing features and rates come through as NaN (NumPy converts None).
+        y = np.fromiter(
+            (sample.get("rate_pct_per_min") for sample in history),
+            dtype=np.float64,
+            count=count,
+        )
+        X = np.fromiter(
+            (tuple(map(sample.get, _FEATURE_KEYS)) for sample in history),
+            dtype=np.dtype((np.float64, 6)),
+            count=count,
+        )
+        np.copyto(X, np.array(_FEATURE_DEFAULTS), where=np.isnan(X))
+
+        # Skip samples without rate data.
+        has_rate = y > 0
+        return X[has_rate], y[has_rate]
 
     def calculate_time_remaining(
         self, battery_pct: float, predicted_rate: float
@@ -452,13 +579,24 @@ class ChargingModel:
 
     def get_model_info(self) -> dict[str, Any]:
         """Get information about the current model."""
+        info = self._model_info_cache
+        if info is None:
+            info = self._model_info_cache = self._build_model_info()
+
+        # Sample count and ML availability change independently of the model.
+        return {
+            **info,
+            "sample_count": self.history_manager.get_sample_count(self.device_id),
+            "sklearn_available": SKLEARN_AVAILABLE,
+        }
+
+    def _build_model_info(self) -> dict[str, Any]:
+        """Build the model information that only changes with the model."""
         info = {
             "model_type": self.selected_model_type,
             "last_training": self.last_training,
             "accuracy": self.model_accuracy,
             "empirical_accuracy": self.empirical_accuracy,
-            "sample_count": self.history_manager.get_sample_count(self.device_id),
-            "sklearn_available": SKLEARN_AVAILABLE,
         }
 
         if self.selected_model_type == ML_MODEL_TYPE and self.ml_model:
@@ -474,6 +612,23 @@ class ChargingModel:
 
         return info
 
+    def _set_last_training(self, last_training: str | None) -> None:
+        """Set the last training time and when retraining becomes due."""
+        self.last_training = last_training
+        self._skipped_retrains = 0
+        try:
+            trained_at = datetime.fromisoformat(last_training)
+        except (ValueError, TypeError):
+            self._retrain_due = None
+            self._trained_ts = None
+            return
+
+        # Older saves stored naive local time.
+        now = dt_util.utcnow() if trained_at.tzinfo else datetime.now()
+        age = (now - trained_at).total_seconds()
+        self._retrain_due = time.monotonic() + RETRAIN_INTERVAL_SECONDS - age
+        self._trained_ts = trained_at.timestamp()
+
     def should_retrain(self) -> bool:
         """Check if model should be retrained."""
         if not SKLEARN_AVAILABLE:
@@ -485,14 +640,46 @@ class ChargingModel:
         if self.last_training is None:
             return sample_count >= MIN_SAMPLES_FOR_TRAINING
 
-        try:
-            last_training_time = datetime.fromisoformat(self.last_training)
-            time_since_training = datetime.now() - last_training_time
+        # Unparseable training time: retrain as soon as there is enough data.
+        if self._retrain_due is None:
+            return sample_count >= MIN_SAMPLES_FOR_TRAINING
 
-            # Retrain if it's been more than 24 hours and we have new samples.
-            return (
-                time_since_training.total_seconds() > 86400
-                and sample_count >= MIN_SAMPLES_FOR_TRAINING
+        # Retrain if it's been more than 24 hours and we have new samples.
+        if (
+            time.monotonic() <= self._retrain_due
+            or sample_count < MIN_SAMPLES_FOR_TRAINING
+        ):
+            return False
+
+        # Skip retraining while charging since the last training looks like
+        # the training data, but never for too many intervals in a row.
+        if (
+            self._trained_rates is not None
+            and self._skipped_retrains < RETRAIN_MAX_SKIPPED_INTERVALS
+            and not self._rates_drifted()
+        ):
+            _LOGGER.debug(
+                "Charging for device %s unchanged since last training", self.device_id
             )
-        except (ValueError, TypeError):
-            return sample_count >= MIN_SAMPLES_FOR_TRAINING
+            self._skipped_retrains += 1
+            self._retrain_due = time.monotonic() + RETRAIN_INTERVAL_SECONDS
+            return False
+
+        return True
+
+    def _rates_drifted(self) -> bool:
+        """Check if samples since the last training differ from the training data."""
+        trained_count, trained_mean = self._trained_rates
+        trained_ts = self._trained_ts
+        # History is kept in time order, so new samples are at the end.
+        new_count, new_mean = _rate_summary(
+            takewhile(
+                lambda sample: sample["ts"] > trained_ts,
+                reversed(self.history_manager.get_history(self.device_id)),
+            )
+        )
+        if not new_count:
+            return False
+        enough_new = new_count >= RETRAIN_MIN_NEW_FRACTION * trained_count
+        shift = abs(new_mean - trained_mean)
+        return enough_new or shift >= RETRAIN_MIN_DRIFT * abs(trained_mean)
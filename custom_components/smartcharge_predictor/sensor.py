@@ -14,15 +14,6 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
-    ATTR_BATTERY_HEALTH,
-    ATTR_CHARGER_POWER,
-    ATTR_HUMIDITY,
-    ATTR_LAST_TRAINING,
-    ATTR_LAST_UPDATED,
-    ATTR_MODEL_TYPE,
-    ATTR_OPTIMIZED_CHARGING,
-    ATTR_TEMPERATURE,
-    ATTR_TIME_REMAINING_MINUTES,
     CONF_DEVICE_NAME,
     DEVICE_CLASS_DURATION,
     DEVICE_CLASS_TIMESTAMP,
@@ -88,13 +79,13 @@ class SmartChargeSensor(CoordinatorEntity[SmartChargeCoordinator], SensorEntity)
         available = (
             self.coordinator.last_update_success and self.coordinator.data is not None
         )
-        _LOGGER.debug(
-            "%s availability -> %s (last_update_success=%s, has_data=%s)",
-            self.__class__.__name__,
-            available,
-            self.coordinator.last_update_success,
-            self.coordinator.data is not None,
-        )
+        if not available:
+            _LOGGER.debug(
+                "%s unavailable (last_update_success=%s, has_data=%s)",
+                self.__class__.__name__,
+                self.coordinator.last_update_success,
+                self.coordinator.data is not None,
+            )
         return available
 
 
@@ -122,11 +113,6 @@ class ChargeTimeRemainingSensor(SmartChargeSensor):
             return None
 
         time_remaining = self.coordinator.data.get("time_remaining")
-        _LOGGER.debug(
-            "%s coordinator data keys: %s",
-            self.__class__.__name__,
-            list(self.coordinator.data.keys()),
-        )
         _LOGGER.debug(
             "%s time_remaining value: %s", self.__class__.__name__, time_remaining
         )
@@ -144,23 +130,7 @@ class ChargeTimeRemainingSensor(SmartChargeSensor):
         if not self.coordinator.data:
             return {}
 
-        attrs = {
-            ATTR_BATTERY_HEALTH: self.coordinator.data.get("battery_health"),
-            ATTR_CHARGER_POWER: self.coordinator.data.get("charger_power_w"),
-            ATTR_TEMPERATURE: self.coordinator.data.get("temperature"),
-            ATTR_HUMIDITY: self.coordinator.data.get("humidity"),
-            ATTR_OPTIMIZED_CHARGING: self.coordinator.data.get("optimized_charging"),
-            ATTR_LAST_UPDATED: self.coordinator.data.get("last_updated"),
-        }
-
-        # Add model info if available
-        model_info = self.coordinator.data.get("model_info", {})
-        if model_info:
-            attrs[ATTR_MODEL_TYPE] = model_info.get("model_type")
-            attrs[ATTR_LAST_TRAINING] = model_info.get("last_training")
-
-        # Remove None values
-        return {k: v for k, v in attrs.items() if v is not None}
+        return self.coordinator.data.get("attrs_time_remaining", {})
 
 
 class FullChargeTimeSensor(SmartChargeSensor):
@@ -185,11 +155,6 @@ class FullChargeTimeSensor(SmartChargeSensor):
             return None
 
         full_charge_time = self.coordinator.data.get("full_charge_time")
-        _LOGGER.debug(
-            "%s coordinator data keys: %s",
-            self.__class__.__name__,
-            list(self.coordinator.data.keys()),
-        )
         _LOGGER.debug(
             "%s full_charge_time value: %s", self.__class__.__name__, full_charge_time
         )
@@ -206,13 +171,7 @@ class FullChargeTimeSensor(SmartChargeSensor):
         if not self.coordinator.data:
             return {}
 
-        attrs = {
-            ATTR_TIME_REMAINING_MINUTES: self.coordinator.data.get("time_remaining"),
-            ATTR_LAST_UPDATED: self.coordinator.data.get("last_updated"),
-        }
-
-        # Remove None values
-        return {k: v for k, v in attrs.items() if v is not None}
+        return self.coordinator.data.get("attrs_full_charge", {})
 
 
 class PredictedRateSensor(SmartChargeSensor):
@@ -238,11 +197,6 @@ class PredictedRateSensor(SmartChargeSensor):
             return None
 
         charge_rate = self.coordinator.data.get("charge_rate")
-        _LOGGER.debug(
-            "%s coordinator data keys: %s",
-            self.__class__.__name__,
-            list(self.coordinator.data.keys()),
-        )
         _LOGGER.debug("%s charge_rate value: %s", self.__class__.__name__, charge_rate)
 
         if charge_rate is None:
@@ -258,24 +212,4 @@ class PredictedRateSensor(SmartChargeSensor):
         if not self.coordinator.data:
             return {}
 
-        attrs = {
-            "calculated_rate": self.coordinator.data.get("calculated_rate"),
-            "battery_pct": self.coordinator.data.get("battery_pct"),
-            ATTR_TEMPERATURE: self.coordinator.data.get("temperature"),
-            ATTR_HUMIDITY: self.coordinator.data.get("humidity"),
-            ATTR_CHARGER_POWER: self.coordinator.data.get("charger_power_w"),
-            ATTR_BATTERY_HEALTH: self.coordinator.data.get("battery_health"),
-            ATTR_OPTIMIZED_CHARGING: self.coordinator.data.get("optimized_charging"),
-            ATTR_LAST_UPDATED: self.coordinator.data.get("last_updated"),
-        }
-
-        # Add model info if available
-        model_info = self.coordinator.data.get("model_info", {})
-        if model_info:
-            attrs[ATTR_MODEL_TYPE] = model_info.get("model_type")
-            attrs[ATTR_LAST_TRAINING] = model_info.get("last_training")
-            attrs["model_accuracy"] = model_info.get("accuracy")
-            attrs["sample_count"] = model_info.get("sample_count")
-
-        # Remove None values
-        return {k: v for k, v in attrs.items() if v is not None}
+        return self.coordinator.data.get("attrs_predicted_rate", {})